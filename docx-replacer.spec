@@ -34,6 +34,8 @@ a = Analysis(
     hiddenimports=[
         'customtkinter',
         'PIL._tkinter_finder',
+        'PIL.Image',
+        'PIL.ImageOps',
         'docx',
         'lxml',
         'pandas',
@@ -46,6 +48,13 @@ a = Analysis(
         'utils.placeholder',
         'utils.config_loader',
         'utils.image_handler',
+        'utils.image_cache',
+        'utils.image_processor',
+        'utils.http_client',
+        'utils.paragraph_xml',
+        'utils.stream_engine',
+        'utils.template_engine',
+        'utils.zip_package',
         'urllib',
         'urllib.request',
     ] + docx_hidden,
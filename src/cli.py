@@ -0,0 +1,310 @@
+"""
+Command line interface untuk DOCX Placeholder Replacer (tanpa GUI)
+Output berupa JSON di stdout, cocok untuk server, container, dan cron job.
+
+Contoh:
+    python src/cli.py scan template.docx
+    python src/cli.py normalize template.docx -o template_clean.docx
+    python src/cli.py render template.docx -c config.csv -o hasil.docx
+    python src/cli.py batch template.docx data.xlsx -o output/ --workers 4
+
+Exit code:
+    0 = sukses
+    1 = gagal (file tidak bisa dibaca, config tidak valid, dll)
+    2 = argumen tidak valid
+    3 = selesai dengan warning (image gagal, sebagian baris batch gagal)
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Add src directory to path supaya bisa dijalankan langsung sebagai script
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.docx_handler import DocxHandler
+from utils.config_loader import ConfigLoader
+from utils.image_cache import ImageCache
+from utils.image_handler import ImageHandler
+from utils.image_processor import ImageProcessor
+
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_USAGE = 2
+EXIT_WARNING = 3
+
+
+class CliError(Exception):
+    """Error yang dilaporkan ke user sebagai JSON dengan exit code EXIT_ERROR"""
+
+
+def _emit(result: Dict[str, any], pretty: bool):
+    """Tulis hasil sebagai JSON ke stdout"""
+    json.dump(result, sys.stdout, indent=2 if pretty else None, ensure_ascii=False)
+    sys.stdout.write('\n')
+
+
+def _parse_assignments(assignments: List[str]) -> Dict[str, str]:
+    """
+    Parse argumen --set NAME=VALUE
+
+    Args:
+        assignments: List string NAME=VALUE
+
+    Returns:
+        Dictionary mapping placeholder -> value
+    """
+    values = {}
+    for assignment in assignments or []:
+        name, separator, value = assignment.partition('=')
+        if not separator or not name.strip():
+            raise CliError(f"Invalid --set value (expected NAME=VALUE): {assignment}")
+        values[ConfigLoader._strip_placeholder_wrapper(name.strip())] = value
+    return values
+
+
+def _split_values(values: Dict[str, str],
+                  image_placeholders: set) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Pisahkan values menjadi text dan image berdasarkan placeholder dokumen
+
+    Returns:
+        Tuple (text_values, image_values)
+    """
+    text_values = {}
+    image_values = {}
+    for placeholder, value in values.items():
+        if placeholder in image_placeholders:
+            if value.strip():
+                image_values[placeholder] = value
+        else:
+            text_values[placeholder] = value
+    return text_values, image_values
+
+
+def _cache_stats() -> Dict[str, int]:
+    """Statistik image cache process ini (None jika cache dimatikan)"""
+    return ImageHandler.cache.stats() if ImageHandler.cache is not None else None
+
+
+def _processor_stats() -> Dict[str, int]:
+    """Statistik image pipeline process ini (None jika tidak diaktifkan)"""
+    return ImageHandler.processor.stats() if ImageHandler.processor is not None else None
+
+
+def _load_handler(template: str) -> DocxHandler:
+    """Load template DOCX, error dilaporkan sebagai CliError"""
+    if not os.path.isfile(template):
+        raise CliError(f"Template not found: {template}")
+    try:
+        return DocxHandler(template)
+    except Exception as e:
+        raise CliError(f"Failed to load document: {str(e)}")
+
+
+def cmd_scan(args) -> Tuple[Dict[str, any], int]:
+    """Subcommand scan: daftar placeholder dalam template"""
+    handler = _load_handler(args.template)
+    text_placeholders, image_placeholders = handler.find_all_placeholders_with_types()
+
+    return {
+        'status': 'success',
+        'template': args.template,
+        'text_placeholders': sorted(text_placeholders),
+        'image_placeholders': sorted(image_placeholders),
+    }, EXIT_OK
+
+
+def cmd_normalize(args) -> Tuple[Dict[str, any], int]:
+    """Subcommand normalize: bersihkan template (proofErr, rsid, run terpecah)"""
+    handler = _load_handler(args.template)
+    output = args.output or args.template
+    try:
+        stats = handler.normalize(output)
+    except Exception as e:
+        raise CliError(f"Failed to normalize document: {str(e)}")
+
+    return {
+        'status': 'success',
+        'template': args.template,
+        'output': output,
+        **stats,
+    }, EXIT_OK
+
+
+def cmd_render(args) -> Tuple[Dict[str, any], int]:
+    """Subcommand render: render satu dokumen dari config dan/atau --set"""
+    values = {}
+    if args.config:
+        config, error = ConfigLoader.load_config(args.config)
+        if error:
+            raise CliError(error)
+        values.update({
+            ConfigLoader._strip_placeholder_wrapper(name): value
+            for name, value in config.items()
+        })
+    values.update(_parse_assignments(args.set))
+
+    handler = _load_handler(args.template)
+    text_placeholders, image_placeholders = handler.find_all_placeholders_with_types()
+    text_values, image_values = _split_values(values, image_placeholders)
+
+    errors = []
+    try:
+        if text_values:
+            handler.replace_placeholders(text_values)
+        if image_values:
+            _, image_errors = handler.replace_image_placeholders(
+                image_values, width_inches=args.width
+            )
+            errors.extend(image_errors)
+        handler.save(args.output)
+    except Exception as e:
+        raise CliError(f"Failed to save document: {str(e)}")
+
+    # Image yang gagal (error "<placeholder>: <pesan>") tidak dihitung sebagai replaced
+    failed = {name for name in image_values if any(e.startswith(f"{name}: ") for e in errors)}
+    replaced = (set(values) - failed) & (text_placeholders | image_placeholders)
+    missing = sorted((text_placeholders | image_placeholders) - set(values))
+    return {
+        'status': 'warning' if errors else 'success',
+        'template': args.template,
+        'output': args.output,
+        'replaced': sorted(replaced),
+        'missing': missing,
+        'errors': errors,
+        'image_cache': _cache_stats(),
+        'image_pipeline': _processor_stats(),
+    }, EXIT_WARNING if errors else EXIT_OK
+
+
+def cmd_batch(args) -> Tuple[Dict[str, any], int]:
+    """Subcommand batch: render 1 dokumen per baris batch config (mail merge)"""
+    rows, error = ConfigLoader.load_batch_config(args.config)
+    if error:
+        raise CliError(error)
+    if not rows:
+        raise CliError("No rows found in the batch config file.")
+
+    handler = _load_handler(args.template)
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    try:
+        results = handler.render_batch(
+            rows, args.output_dir, width_inches=args.width, workers=args.workers,
+            chunk_size=args.chunk_size
+        )
+    except Exception as e:
+        raise CliError(f"Batch render failed: {str(e)}")
+
+    if args.report:
+        saved, error = ConfigLoader.save_batch_report(args.report, results)
+        if not saved:
+            raise CliError(error)
+
+    counts = {
+        status: sum(1 for r in results if r['status'] == status)
+        for status in ('success', 'warning', 'error')
+    }
+    failed = counts['warning'] or counts['error']
+    return {
+        'status': 'warning' if failed else 'success',
+        'template': args.template,
+        'output_dir': args.output_dir,
+        'report': args.report,
+        'total': len(results),
+        **counts,
+        'image_cache': _cache_stats(),
+        'image_pipeline': _processor_stats(),
+        'results': results,
+    }, EXIT_WARNING if failed else EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Buat argument parser untuk semua subcommand"""
+    parser = argparse.ArgumentParser(
+        prog='docx-replacer',
+        description='Replace ${text} and @{image} placeholders in DOCX files (headless).'
+    )
+    parser.add_argument('--pretty', action='store_true', help='Indent JSON output')
+    parser.add_argument('--image-cache', action='store_true',
+                        help='Cache downloaded images on disk (~/.cache/docx-replacer/images)')
+    parser.add_argument('--image-cache-dir', metavar='DIR',
+                        help='Cache downloaded images on disk in DIR (implies --image-cache)')
+    parser.add_argument('--no-image-cache', action='store_true',
+                        help='Download images into memory without the on-disk cache (default)')
+    parser.add_argument('--image-dpi', type=int, metavar='DPI',
+                        help='Downscale/recompress images to this resolution at the '
+                             'target width (default: insert images unchanged)')
+    parser.add_argument('--image-quality', type=int, default=85, metavar='Q',
+                        help='JPEG quality for recompressed images (used with --image-dpi)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    scan = subparsers.add_parser('scan', help='List placeholders in a template')
+    scan.add_argument('template', help='DOCX template')
+    scan.set_defaults(func=cmd_scan)
+
+    normalize = subparsers.add_parser(
+        'normalize', help='Clean a template: merge split runs, strip proofErr/rsid noise'
+    )
+    normalize.add_argument('template', help='DOCX template')
+    normalize.add_argument('-o', '--output', help='Output template (default: overwrite template)')
+    normalize.set_defaults(func=cmd_normalize)
+
+    render = subparsers.add_parser('render', help='Render one document')
+    render.add_argument('template', help='DOCX template')
+    render.add_argument('-o', '--output', required=True, help='Output DOCX file')
+    render.add_argument('-c', '--config', help='Config file (CSV/XLSX: placeholder, value)')
+    render.add_argument('--set', action='append', metavar='NAME=VALUE',
+                        help='Placeholder value (can be repeated, overrides config)')
+    render.add_argument('--width', type=float, default=3.0, help='Image width in inches')
+    render.set_defaults(func=cmd_render)
+
+    batch = subparsers.add_parser('batch', help='Render one document per config row')
+    batch.add_argument('template', help='DOCX template')
+    batch.add_argument('config', help='Batch config file (CSV/XLSX, one row per document)')
+    batch.add_argument('-o', '--output-dir', required=True, help='Output folder')
+    batch.add_argument('--report', help='Write per-row status report (CSV/XLSX)')
+    batch.add_argument('--workers', type=int, default=1,
+                       help='Worker processes (0 = one per CPU core)')
+    batch.add_argument('--chunk-size', type=int, default=16, metavar='N',
+                       help='Rows sent to a worker process at once (used with --workers)')
+    batch.add_argument('--width', type=float, default=3.0, help='Image width in inches')
+    batch.set_defaults(func=cmd_batch)
+
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Entry point CLI
+
+    Args:
+        argv: Argumen command line (default: sys.argv[1:])
+
+    Returns:
+        Exit code
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if (args.image_cache or args.image_cache_dir) and not args.no_image_cache:
+        ImageHandler.cache = ImageCache(args.image_cache_dir)
+    if args.image_dpi:
+        ImageHandler.processor = ImageProcessor(dpi=args.image_dpi,
+                                                jpeg_quality=args.image_quality)
+
+    try:
+        result, code = args.func(args)
+    except CliError as e:
+        result, code = {'status': 'error', 'message': str(e)}, EXIT_ERROR
+
+    _emit(result, args.pretty)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
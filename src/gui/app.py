@@ -5,6 +5,8 @@ import customtkinter as ctk
 from tkinter import filedialog, messagebox
 from typing import Dict, List
 import os
+import queue
+import threading
 from pathlib import Path
 import sys
 
@@ -267,6 +269,18 @@ class DocxReplacerApp(ctk.CTk):
         )
         self.export_template_button.grid(row=0, column=2, padx=5)
 
+        # Batch Render button
+        self.batch_button = ctk.CTkButton(
+            title_frame,
+            text="Batch Render",
+            command=self.batch_render,
+            width=130,
+            state="disabled",
+            fg_color="purple",
+            hover_color="#4b0082"
+        )
+        self.batch_button.grid(row=0, column=3, padx=5)
+
         # Placeholder table
         self.placeholder_table = PlaceholderTable(middle_frame)
         self.placeholder_table.grid(row=1, column=0, sticky="nsew", padx=10, pady=5)
@@ -296,6 +310,16 @@ class DocxReplacerApp(ctk.CTk):
         )
         self.clear_button.pack(side="right", padx=5)
 
+        # Batch progress (diisi saat batch render berjalan)
+        self.progress_bar = ctk.CTkProgressBar(bottom_frame, width=200)
+        self.progress_bar.set(0)
+        self.progress_label = ctk.CTkLabel(
+            bottom_frame,
+            text="",
+            font=ctk.CTkFont(size=12)
+        )
+        self.progress_label.pack(side="left", padx=10)
+
     def load_docx(self):
         """Load DOCX file dan scan placeholders"""
         file_path = filedialog.askopenfilename(
@@ -342,6 +366,7 @@ class DocxReplacerApp(ctk.CTk):
             self.clear_button.configure(state="normal")
             self.load_config_button.configure(state="normal")
             self.export_template_button.configure(state="normal")
+            self.batch_button.configure(state="normal")
 
             total_count = len(text_placeholders) + len(image_placeholders)
             messagebox.showinfo(
@@ -424,15 +449,16 @@ class DocxReplacerApp(ctk.CTk):
                     f"Document saved successfully!\n\n{output_path}"
                 )
 
-            # Reload the original document
-            self.docx_handler.load(self.current_file)
-
         except Exception as e:
             messagebox.showerror(
                 "Error",
                 f"Failed to save document:\n{str(e)}"
             )
 
+        finally:
+            # Restore the original template from memory (no reload from disk)
+            self.docx_handler.reset()
+
     def load_config(self):
         """Load config dari CSV atau XLSX dan auto-fill values"""
         all_placeholders = self.current_text_placeholders | self.current_image_placeholders
@@ -498,6 +524,138 @@ class DocxReplacerApp(ctk.CTk):
                 f"Failed to load config:\n{str(e)}"
             )
 
+    def batch_render(self):
+        """Render banyak dokumen dari batch config (1 baris per dokumen)"""
+        if not self.docx_handler:
+            return
+
+        # Open file dialog
+        file_path = filedialog.askopenfilename(
+            title="Select Batch Config File",
+            filetypes=[
+                ("CSV Files", "*.csv"),
+                ("Excel Files", "*.xlsx *.xls"),
+                ("All Files", "*.*")
+            ]
+        )
+
+        if not file_path:
+            return
+
+        output_dir = filedialog.askdirectory(title="Select Output Folder")
+
+        if not output_dir:
+            return
+
+        try:
+            rows, error = ConfigLoader.load_batch_config(file_path)
+
+            if error:
+                messagebox.showerror("Error", error)
+                return
+
+            if not rows:
+                messagebox.showwarning(
+                    "Empty Config",
+                    "No rows found in the batch config file."
+                )
+                return
+
+        except Exception as e:
+            messagebox.showerror(
+                "Error",
+                f"Failed to load batch config:\n{str(e)}"
+            )
+            return
+
+        # Render di background thread supaya window tetap responsif;
+        # thread hanya mengirim event lewat queue, widget diubah dari main thread
+        events = queue.Queue()
+        self._set_batch_running(True, len(rows))
+        threading.Thread(
+            target=self._run_batch,
+            args=(rows, output_dir, events),
+            daemon=True
+        ).start()
+        self.after(100, self._poll_batch, events)
+
+    def _run_batch(self, rows: List[Dict[str, str]], output_dir: str, events: queue.Queue):
+        """Jalankan render_batch dan simpan report (dipanggil di background thread)"""
+        try:
+            results = self.docx_handler.render_batch(
+                rows, output_dir, width_inches=3.0,
+                progress=lambda done, total: events.put(('progress', done, total))
+            )
+
+            # Save per-row status report
+            report_path = os.path.join(output_dir, "batch_report.csv")
+            saved, report_error = ConfigLoader.save_batch_report(report_path, results)
+            if not saved:
+                report_path = None
+            events.put(('done', results, report_path, report_error))
+
+        except Exception as e:
+            events.put(('error', str(e)))
+
+    def _poll_batch(self, events: queue.Queue):
+        """Proses event dari thread batch, lalu jadwalkan poll berikutnya"""
+        try:
+            while True:
+                event = events.get_nowait()
+                if event[0] == 'progress':
+                    _, done, total = event
+                    self.progress_bar.set(done / total)
+                    self.progress_label.configure(text=f"Rendering {done}/{total}...")
+                else:
+                    self._set_batch_running(False)
+                    self._finish_batch(event)
+                    return
+        except queue.Empty:
+            pass
+        self.after(100, self._poll_batch, events)
+
+    def _set_batch_running(self, running: bool, total: int = 0):
+        """Tampilkan progress dan kunci tombol selama batch berjalan"""
+        state = "disabled" if running else "normal"
+        for button in (self.load_button, self.load_config_button, self.export_template_button,
+                       self.batch_button, self.replace_button, self.clear_button):
+            button.configure(state=state)
+
+        if running:
+            self.progress_bar.set(0)
+            self.progress_bar.pack(side="left", padx=10)
+            self.progress_label.configure(text=f"Rendering 0/{total}...")
+        else:
+            self.progress_bar.pack_forget()
+            self.progress_label.configure(text="")
+
+    def _finish_batch(self, event: tuple):
+        """Tampilkan hasil batch render"""
+        if event[0] == 'error':
+            messagebox.showerror(
+                "Error",
+                f"Failed to render batch:\n{event[1]}"
+            )
+            return
+
+        _, results, report_path, report_error = event
+        failed = [r for r in results if r['status'] == 'error']
+        warnings = [r for r in results if r['status'] == 'warning']
+        message = (
+            f"Rendered {len(results) - len(failed)} of {len(results)} document(s).\n"
+            f"- Warnings: {len(warnings)}\n"
+            f"- Errors: {len(failed)}\n\n"
+        )
+        if report_path:
+            message += f"Report: {report_path}"
+        else:
+            message += f"Report not saved: {report_error}"
+
+        if failed or warnings or not report_path:
+            messagebox.showwarning("Batch Completed with Warnings", message)
+        else:
+            messagebox.showinfo("Batch Completed", message)
+
     def export_template(self):
         """Export template config file"""
         all_placeholders = self.current_text_placeholders | self.current_image_placeholders
@@ -2,15 +2,20 @@
 Module untuk load config dari CSV atau XLSX
 Config format: 2 kolom (placeholder, value)
 """
-import pandas as pd
-from typing import Dict, Tuple
+import csv
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Tuple
 from pathlib import Path
 
+# pandas dan openpyxl baru diimport saat membaca/menulis XLSX, supaya
+# startup aplikasi (dan CLI) tidak ikut menanggung waktu import-nya
+
 
 class ConfigLoader:
     """Handler untuk load config dari CSV/XLSX"""
 
     SUPPORTED_FORMATS = ['.csv', '.xlsx', '.xls']
+    OUTPUT_COLUMN = 'output_filename'  # Kolom pola nama file output di batch config
 
     @staticmethod
     def load_config(file_path: str) -> Tuple[Dict[str, str], str]:
@@ -29,40 +34,169 @@ class ConfigLoader:
             if file_ext not in ConfigLoader.SUPPORTED_FORMATS:
                 return {}, f"Unsupported file format: {file_ext}. Use CSV or XLSX."
 
-            # Load file
-            if file_ext == '.csv':
-                df = pd.read_csv(file_path)
-            else:  # .xlsx or .xls
-                df = pd.read_excel(file_path)
+            with ConfigLoader._read_rows(file_path) as rows:
+                header = next(rows, ())
+                if len(header) < 2:
+                    return {}, "Config file must have at least 2 columns (placeholder, value)"
+                return ConfigLoader._config_from_rows(rows), ""
 
-            # Validate columns
-            if df.shape[1] < 2:
-                return {}, "Config file must have at least 2 columns (placeholder, value)"
+        except Exception as e:
+            return {}, f"Failed to load config: {str(e)}"
 
-            # Get first 2 columns
-            df = df.iloc[:, :2]
-            df.columns = ['placeholder', 'value']
+    @staticmethod
+    def _config_from_rows(rows: Iterable[List[str]]) -> Dict[str, str]:
+        """
+        Bangun config dari baris data (kolom 1 = placeholder, kolom 2 = value)
 
-            # Remove rows with empty placeholder
-            df = df[df['placeholder'].notna()]
-            df = df[df['placeholder'].astype(str).str.strip() != '']
+        Args:
+            rows: Baris data (tanpa header)
 
-            # Convert to dictionary
-            config = {}
-            for _, row in df.iterrows():
-                placeholder = str(row['placeholder']).strip()
-                value = str(row['value']) if pd.notna(row['value']) else ''
+        Returns:
+            Dictionary mapping placeholder -> value
+        """
+        cell_text = ConfigLoader._cell_text
+        config = {}
+        for row in rows:
+            # Baris kosong atau placeholder kosong dilewati
+            placeholder = cell_text(row[0]).strip() if row else ''
+            if not placeholder:
+                continue
 
-                # Remove ${} if present in config file
-                if placeholder.startswith('${') and placeholder.endswith('}'):
-                    placeholder = placeholder[2:-1]
+            # Remove ${} if present in config file
+            if placeholder.startswith('${') and placeholder.endswith('}'):
+                placeholder = placeholder[2:-1]
 
-                config[placeholder] = value
+            config[placeholder] = cell_text(row[1]) if len(row) > 1 else ''
+        return config
 
-            return config, ""
+    @staticmethod
+    def _cell_text(value) -> str:
+        """Nilai cell sebagai text (cell kosong = string kosong)"""
+        if value is None:
+            return ''
+        return value if isinstance(value, str) else str(value)
+
+    @staticmethod
+    @contextmanager
+    def _read_rows(file_path: str) -> Iterator[Iterator[tuple]]:
+        """
+        Buka file CSV/XLSX sebagai iterator baris (termasuk header).
+        Baris dibaca satu per satu: CSV lewat modul csv, XLSX lewat openpyxl
+        read-only, sehingga memory tidak bergantung pada jumlah baris.
+
+        Args:
+            file_path: Path ke file CSV, XLSX, atau XLS
+
+        Yields:
+            Iterator tuple/list nilai cell per baris (cell kosong XLSX = None)
+        """
+        file_ext = Path(file_path).suffix.lower()
+
+        if file_ext == '.csv':
+            with open(file_path, newline='', encoding='utf-8-sig') as f:
+                yield csv.reader(f)
+
+        elif file_ext == '.xlsx':
+            from openpyxl import load_workbook
+
+            workbook = load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                yield workbook.worksheets[0].iter_rows(values_only=True)
+            finally:
+                workbook.close()
+
+        else:  # .xls tidak didukung openpyxl, fallback ke pandas
+            import pandas as pd
+
+            df = pd.read_excel(file_path, header=None, dtype=object)
+            yield df.where(df.notna(), None).itertuples(index=False, name=None)
+
+    @staticmethod
+    def _strip_placeholder_wrapper(name: str) -> str:
+        """Hapus wrapper ${} atau @{} dari nama placeholder jika ada"""
+        name = name.strip()
+        if name[:2] in ('${', '@{') and name.endswith('}'):
+            name = name[2:-1]
+        return name
+
+    @staticmethod
+    def load_batch_config(file_path: str) -> Tuple[List[Dict[str, str]], str]:
+        """
+        Load batch (mail merge) config dari file CSV atau XLSX
+        Format: 1 baris per dokumen output, 1 kolom per placeholder,
+        plus kolom opsional 'output_filename' berisi pola nama file
+        (boleh memakai placeholder, misalnya "surat_${nama}.docx")
+
+        Args:
+            file_path: Path ke file batch config
+
+        Returns:
+            Tuple (List of dictionary placeholder -> value per baris, error message if any)
+        """
+        try:
+            file_ext = Path(file_path).suffix.lower()
+
+            if file_ext not in ConfigLoader.SUPPORTED_FORMATS:
+                return [], f"Unsupported file format: {file_ext}. Use CSV or XLSX."
+
+            # Semua cell dibaca sebagai text apa adanya
+            with ConfigLoader._read_rows(file_path) as records:
+                header = next(records, ())
+                if len(header) < 1:
+                    return [], "Batch config must have at least 1 placeholder column"
+
+                columns = [
+                    ConfigLoader._strip_placeholder_wrapper(str(c)) if c is not None
+                    else f"Unnamed: {i}"
+                    for i, c in enumerate(header)
+                ]
+
+                cell_text = ConfigLoader._cell_text
+                rows = []
+                for values in records:
+                    row = dict.fromkeys(columns, '')
+                    row.update(
+                        (column, cell_text(value)) for column, value in zip(columns, values)
+                    )
+                    # Skip baris kosong
+                    if any(value.strip() for value in row.values()):
+                        rows.append(row)
+
+            return rows, ""
 
         except Exception as e:
-            return {}, f"Failed to load config: {str(e)}"
+            return [], f"Failed to load batch config: {str(e)}"
+
+    @staticmethod
+    def save_batch_report(file_path: str, results: List[Dict[str, str]]) -> Tuple[bool, str]:
+        """
+        Simpan status per baris hasil batch render
+
+        Args:
+            file_path: Path output file report (CSV atau XLSX)
+            results: List status per baris dari DocxHandler.render_batch
+
+        Returns:
+            Tuple (success, error_message)
+        """
+        try:
+            file_ext = Path(file_path).suffix.lower()
+            columns = ['row', 'output', 'status', 'message']
+            records = [[result.get(column, '') for column in columns] for result in results]
+
+            if file_ext == '.csv':
+                ConfigLoader._write_csv(file_path, columns, records)
+            elif file_ext in ['.xlsx', '.xls']:
+                import pandas as pd
+
+                pd.DataFrame(records, columns=columns).to_excel(file_path, index=False)
+            else:
+                return False, f"Unsupported format: {file_ext}"
+
+            return True, ""
+
+        except Exception as e:
+            return False, f"Failed to save batch report: {str(e)}"
 
     @staticmethod
     def validate_config(config: Dict[str, str], placeholders: set) -> Tuple[bool, str, list, list]:
@@ -111,17 +245,16 @@ class ConfigLoader:
         try:
             file_ext = Path(file_path).suffix.lower()
 
-            # Create DataFrame
-            df = pd.DataFrame({
-                'placeholder': [f"${{{p}}}" for p in sorted(placeholders)],
-                'value': [''] * len(placeholders)
-            })
+            columns = ['placeholder', 'value']
+            records = [[f"${{{p}}}", ''] for p in sorted(placeholders)]
 
             # Save based on format
             if file_ext == '.csv':
-                df.to_csv(file_path, index=False)
+                ConfigLoader._write_csv(file_path, columns, records)
             elif file_ext in ['.xlsx', '.xls']:
-                df.to_excel(file_path, index=False)
+                import pandas as pd
+
+                pd.DataFrame(records, columns=columns).to_excel(file_path, index=False)
             else:
                 return False, f"Unsupported format: {file_ext}"
 
@@ -129,3 +262,11 @@ class ConfigLoader:
 
         except Exception as e:
             return False, f"Failed to save template: {str(e)}"
+
+    @staticmethod
+    def _write_csv(file_path: str, columns: List[str], records: Iterable[list]):
+        """Tulis CSV dengan header (format sama seperti DataFrame.to_csv)"""
+        with open(file_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(columns)
+            writer.writerows(records)
@@ -3,14 +3,94 @@ Module untuk handling file DOCX - load, scan, dan save
 """
 from docx import Document
 from docx.text.paragraph import Paragraph
+from docx.text.run import Run
 from docx.table import Table, _Cell
 from docx.shared import Inches
-from docx.oxml import parse_xml
+from docx.oxml import OxmlElement, parse_xml
 from docx.oxml.ns import nsdecls
-from typing import Set, Dict, List, Tuple
-from .placeholder import PlaceholderHandler
-from .image_handler import ImageHandler
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.opc.pkgwriter import PackageWriter
+from docx.oxml.shape import CT_Inline
+from docx.image.image import Image
+from docx.parts.image import ImagePart
+from docx.parts.story import StoryPart
+from typing import BinaryIO, Callable, Set, Dict, List, Tuple, Iterable, Optional, Union
+from dataclasses import dataclass
+from bisect import bisect_right
+from collections import OrderedDict
+from copy import deepcopy
+from io import BytesIO
+from .placeholder import PlaceholderHandler, PlaceholderMatcher
+from .image_handler import ImageHandler, ImageSource
+from .image_cache import ImageCache
+from .image_processor import ImageProcessor
+from .template_engine import CompiledTemplate, prefetch_images, render
+from .paragraph_xml import W_T, candidate_paragraphs, normalize_part, set_text
+from .zip_package import ChecksumWriter, RawCopyWriter
+from .config_loader import ConfigLoader
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import hashlib
+import os
 import re
+import threading
+
+
+# Cache isi file template: path -> (mtime_ns, size, sha1, bytes)
+_TEMPLATE_CACHE_SIZE = 8
+_template_cache: "OrderedDict[str, Tuple[int, int, str, bytes]]" = OrderedDict()
+_template_cache_lock = threading.Lock()
+
+
+def read_template(file_path: str) -> Tuple[bytes, str]:
+    """
+    Baca isi file template DOCX, memakai cache selama mtime dan ukuran file
+    tidak berubah (load ulang file yang sama tidak membaca disk lagi)
+
+    Args:
+        file_path: Path ke file DOCX
+
+    Returns:
+        Tuple (isi file, sha1 hex digest)
+    """
+    key = os.path.abspath(file_path)
+    stat = os.stat(key)
+
+    with _template_cache_lock:
+        entry = _template_cache.get(key)
+        if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+            _template_cache.move_to_end(key)
+            return entry[3], entry[2]
+
+    with open(key, 'rb') as f:
+        content = f.read()
+    digest = hashlib.sha1(content).hexdigest()
+
+    with _template_cache_lock:
+        # File yang hanya di-touch (isi sama) tetap memakai bytes yang sudah ada
+        if entry is not None and entry[2] == digest:
+            content = entry[3]
+        _template_cache[key] = (stat.st_mtime_ns, stat.st_size, digest, content)
+        _template_cache.move_to_end(key)
+        while len(_template_cache) > _TEMPLATE_CACHE_SIZE:
+            _template_cache.popitem(last=False)
+
+    return content, digest
+
+
+@dataclass
+class PlaceholderLocation:
+    """Lokasi satu kemunculan placeholder dalam dokumen"""
+
+    paragraph: Paragraph
+    part: object                # Story part (document, header, atau footer)
+    start: int                  # Offset awal dalam teks gabungan run
+    end: int                    # Offset akhir (exclusive)
+    run_start: Optional[int]    # Index run tempat placeholder dimulai
+    run_end: Optional[int]      # Index run tempat placeholder berakhir
+    # w:t yang memuat placeholder utuh (fast path), None jika placeholder
+    # terpecah ke beberapa run/w:t dan perlu run rebuild
+    text_node: object = None
 
 
 class DocxHandler:
@@ -25,6 +105,16 @@ class DocxHandler:
         """
         self.file_path = file_path
         self.document = None
+        self.template_hash: str = None
+        self._source: bytes = None
+        self._snapshot: Dict[StoryPart, Tuple[object, Set[str]]] = {}
+        self._compiled: CompiledTemplate = None
+        self._compile_lock = threading.Lock()
+        self._text_index: Dict[str, List[PlaceholderLocation]] = None
+        self._image_index: Dict[str, List[PlaceholderLocation]] = None
+        self._baseline: Dict[str, Tuple[int, int]] = {}
+        self._image_parts: Dict[str, ImagePart] = None  # SHA1 -> image part dalam package
+        self._template_image_count = 0  # Jumlah image part bawaan template
         if file_path:
             self.load(file_path)
 
@@ -36,7 +126,252 @@ class DocxHandler:
             file_path: Path ke file DOCX
         """
         self.file_path = file_path
-        self.document = Document(file_path)
+        self._source, self.template_hash = read_template(file_path)
+        self.document = Document(BytesIO(self._source))
+        self._compiled = None
+        self._text_index = None
+        self._image_index = None
+        self._image_parts = None
+        self._template_image_count = len(self.document.part.package.image_parts)
+
+        # Salinan XML story part yang tidak pernah diubah, untuk reset()
+        self._snapshot = {
+            part: (deepcopy(part.element), set(part.rels))
+            for part in self.document.part.package.iter_parts()
+            if isinstance(part, StoryPart)
+        }
+
+        # Baseline checksum setiap member, untuk mendeteksi part yang berubah saat save
+        baseline = ChecksumWriter()
+        self._write_package(baseline)
+        self._baseline = baseline.checksums
+
+    def reset(self):
+        """
+        Kembalikan dokumen ke isi template setelah replace/save, tanpa membaca
+        dan parse ulang file dari disk (cukup copy XML story part yang disimpan)
+        """
+        if not self.document:
+            return
+
+        for part, (element, rel_ids) in self._snapshot.items():
+            part._element = deepcopy(element)
+
+            # Buang relationship yang ditambahkan sejak load (misalnya image)
+            for rId in [rId for rId in part.rels if rId not in rel_ids]:
+                del part.rels[rId]
+                part.rels._target_parts_by_rId.pop(rId, None)
+
+        # Image part yang ditambahkan sejak load sudah tidak direferensikan; buang
+        # supaya tidak menumpuk di package selama handler dipakai ulang
+        image_parts = self.document.part.package.image_parts
+        del image_parts._image_parts[self._template_image_count:]
+        if self._image_parts is not None:
+            kept = {id(part) for part in image_parts}
+            self._image_parts = {
+                sha1: part for sha1, part in self._image_parts.items() if id(part) in kept
+            }
+
+        self.document = self.document.part.document
+        self._text_index = None
+        self._image_index = None
+
+    def normalize(self, output_path: str = None) -> Dict[str, int]:
+        """
+        Normalisasi template sekali: hapus w:proofErr dan atribut w:rsid*, lalu
+        gabungkan run bersebelahan dengan formatting sama (lihat normalize_part).
+        Hasilnya disimpan sebagai template baru dan langsung diload, sehingga
+        scan dan render berikutnya memproses jauh lebih sedikit node.
+
+        Args:
+            output_path: Path template hasil normalisasi
+                         (default: menimpa file template yang diload)
+
+        Returns:
+            Dictionary jumlah node yang dibersihkan
+            {'proof_errors', 'rsid_attributes', 'runs_merged'}
+        """
+        if not self.document:
+            return {}
+
+        # Normalisasi selalu dari isi template, bukan hasil replace
+        self.reset()
+
+        stats = {'proof_errors': 0, 'rsid_attributes': 0, 'runs_merged': 0}
+        for part in self._snapshot:
+            for name, count in normalize_part(part.element).items():
+                stats[name] += count
+
+        output_path = output_path or self.file_path
+        self.save(output_path)
+        self.load(output_path)
+        return stats
+
+    def _story_parts(self) -> List[StoryPart]:
+        """
+        Story part yang discan: main document, header, dan footer. Header/footer
+        yang di-link antar section hanya muncul sekali.
+
+        Returns:
+            List story part, main document lebih dulu
+        """
+        document_part = self.document.part
+        parts = [document_part]
+        for reltype in (RT.HEADER, RT.FOOTER):
+            parts += [
+                rel.target_part for rel in document_part.rels.values()
+                if rel.reltype == reltype and not rel.is_external
+            ]
+        return parts
+
+    def _iter_paragraphs(self):
+        """
+        Iterasi paragraph yang mungkin berisi placeholder: body, tabel, header,
+        dan footer. Kandidat dicari langsung di XML (candidate_paragraphs), jadi
+        object Paragraph hanya dibuat untuk paragraph yang teksnya memuat '{'.
+
+        Yields:
+            Paragraph object dari python-docx
+        """
+        for part in self._story_parts():
+            for element in candidate_paragraphs(part.element):
+                yield Paragraph(element, part)
+
+    def _index_paragraph(self, paragraph: Paragraph):
+        """
+        Catat lokasi semua placeholder dalam satu paragraph ke index
+
+        Args:
+            paragraph: Paragraph object dari python-docx
+        """
+        found_text, found_image = PlaceholderHandler.find_all_placeholders_with_type(
+            paragraph.text
+        )
+        if not found_text and not found_image:
+            return
+
+        # Offset awal setiap run dalam teks gabungan run
+        runs = paragraph.runs
+        run_texts = [run.text for run in runs]
+        run_offsets = []
+        position = 0
+        for run_text in run_texts:
+            run_offsets.append(position)
+            position += len(run_text)
+        runs_text = ''.join(run_texts)
+
+        part = paragraph.part
+        located_text = set()
+        located_image = set()
+
+        # Text dan image dicari terpisah (lihat find_all_placeholders_with_type)
+        matches = [
+            (match, self._text_index, located_text)
+            for match in PlaceholderHandler.TEXT_PLACEHOLDER_REGEX.finditer(runs_text)
+        ] + [
+            (match, self._image_index, located_image)
+            for match in PlaceholderHandler.IMAGE_PLACEHOLDER_REGEX.finditer(runs_text)
+        ]
+        for match, index, located in matches:
+            name = match.group(1)
+            run_start = bisect_right(run_offsets, match.start()) - 1
+            run_end = bisect_right(run_offsets, match.end() - 1) - 1
+            text_node = None
+            if run_start == run_end:
+                text_node = self._single_text_node(runs[run_start], run_texts[run_start])
+
+            index.setdefault(name, []).append(PlaceholderLocation(
+                paragraph=paragraph,
+                part=part,
+                start=match.start(),
+                end=match.end(),
+                run_start=run_start,
+                run_end=run_end,
+                text_node=text_node,
+            ))
+            located.add(name)
+
+        # Placeholder di luar run biasa (misalnya dalam hyperlink) tetap
+        # dicatat paragraph-nya, tanpa offset run
+        for names, index, located in (
+            (found_text, self._text_index, located_text),
+            (found_image, self._image_index, located_image),
+        ):
+            for name in names - located:
+                index.setdefault(name, []).append(PlaceholderLocation(
+                    paragraph=paragraph,
+                    part=part,
+                    start=-1,
+                    end=-1,
+                    run_start=None,
+                    run_end=None,
+                ))
+
+    def _build_index(self):
+        """Scan dokumen sekali dan bangun index lokasi placeholder"""
+        if self._text_index is not None:
+            return
+
+        self._text_index = {}
+        self._image_index = {}
+        for paragraph in self._iter_paragraphs():
+            self._index_paragraph(paragraph)
+
+    def _reindex_paragraphs(self, paragraphs: Iterable[Paragraph]):
+        """
+        Perbarui index untuk paragraph yang baru saja diubah
+
+        Args:
+            paragraphs: Paragraph yang isinya sudah berubah
+        """
+        paragraphs = self._unique_paragraphs(paragraphs)
+        elements = {id(paragraph._p) for paragraph in paragraphs}
+
+        for index in (self._text_index, self._image_index):
+            for name in list(index):
+                locations = [
+                    location for location in index[name]
+                    if id(location.paragraph._p) not in elements
+                ]
+                if locations:
+                    index[name] = locations
+                else:
+                    del index[name]
+
+        for paragraph in paragraphs:
+            self._index_paragraph(paragraph)
+
+    @staticmethod
+    def _unique_paragraphs(paragraphs: Iterable[Paragraph]) -> List[Paragraph]:
+        """
+        Buang paragraph duplikat (proxy berbeda untuk XML element yang sama,
+        misalnya merged cell atau header yang di-link antar section)
+
+        Args:
+            paragraphs: Paragraph dari index
+
+        Returns:
+            List paragraph tanpa duplikat, urutan sesuai kemunculan
+        """
+        seen = set()
+        unique = []
+        for paragraph in paragraphs:
+            key = id(paragraph._p)
+            if key not in seen:
+                seen.add(key)
+                unique.append(paragraph)
+        return unique
+
+    def _scan_placeholders(self) -> Tuple[Set[str], Set[str]]:
+        """
+        Scan dokumen sekali untuk text (${}) dan image (@{}) placeholder.
+        Index di-cache dan diperbarui setiap kali dokumen diubah.
+
+        Returns:
+            Tuple (text_placeholders, image_placeholders)
+        """
+        self._build_index()
+        return set(self._text_index), set(self._image_index)
 
     def find_all_placeholders(self) -> Set[str]:
         """
@@ -48,39 +383,7 @@ class DocxHandler:
         if not self.document:
             return set()
 
-        placeholders = set()
-
-        # Scan paragraphs
-        for paragraph in self.document.paragraphs:
-            placeholders.update(
-                PlaceholderHandler.find_placeholders(paragraph.text)
-            )
-
-        # Scan tables
-        for table in self.document.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        placeholders.update(
-                            PlaceholderHandler.find_placeholders(paragraph.text)
-                        )
-
-        # Scan headers
-        for section in self.document.sections:
-            header = section.header
-            for paragraph in header.paragraphs:
-                placeholders.update(
-                    PlaceholderHandler.find_placeholders(paragraph.text)
-                )
-
-            # Scan footers
-            footer = section.footer
-            for paragraph in footer.paragraphs:
-                placeholders.update(
-                    PlaceholderHandler.find_placeholders(paragraph.text)
-                )
-
-        return placeholders
+        return self._scan_placeholders()[0]
 
     def find_all_image_placeholders(self) -> Set[str]:
         """
@@ -92,38 +395,7 @@ class DocxHandler:
         if not self.document:
             return set()
 
-        placeholders = set()
-
-        # Scan paragraphs
-        for paragraph in self.document.paragraphs:
-            placeholders.update(
-                PlaceholderHandler.find_image_placeholders(paragraph.text)
-            )
-
-        # Scan tables
-        for table in self.document.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        placeholders.update(
-                            PlaceholderHandler.find_image_placeholders(paragraph.text)
-                        )
-
-        # Scan headers and footers
-        for section in self.document.sections:
-            # Headers
-            for paragraph in section.header.paragraphs:
-                placeholders.update(
-                    PlaceholderHandler.find_image_placeholders(paragraph.text)
-                )
-
-            # Footers
-            for paragraph in section.footer.paragraphs:
-                placeholders.update(
-                    PlaceholderHandler.find_image_placeholders(paragraph.text)
-                )
-
-        return placeholders
+        return self._scan_placeholders()[1]
 
     def find_all_placeholders_with_types(self) -> Tuple[Set[str], Set[str]]:
         """
@@ -132,9 +404,10 @@ class DocxHandler:
         Returns:
             Tuple (text_placeholders, image_placeholders)
         """
-        text_placeholders = self.find_all_placeholders()
-        image_placeholders = self.find_all_image_placeholders()
-        return text_placeholders, image_placeholders
+        if not self.document:
+            return set(), set()
+
+        return self._scan_placeholders()
 
     def replace_placeholders(self, replacements: Dict[str, str]):
         """
@@ -146,165 +419,202 @@ class DocxHandler:
         if not self.document:
             return
 
-        # Replace in paragraphs
-        for paragraph in self.document.paragraphs:
-            self._replace_in_paragraph(paragraph, replacements)
+        self._build_index()
 
-        # Replace in tables
-        for table in self.document.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        self._replace_in_paragraph(paragraph, replacements)
+        # Hanya paragraph yang tercatat di index yang perlu dikunjungi
+        by_paragraph: Dict[int, Tuple[Paragraph, List[PlaceholderLocation]]] = {}
+        for placeholder in replacements:
+            for location in self._text_index.get(placeholder, ()):
+                key = id(location.paragraph._p)
+                by_paragraph.setdefault(key, (location.paragraph, []))[1].append(location)
 
-        # Replace in headers and footers
-        for section in self.document.sections:
-            # Headers
-            for paragraph in section.header.paragraphs:
-                self._replace_in_paragraph(paragraph, replacements)
+        matcher = PlaceholderHandler.get_matcher(replacements)
+        for paragraph, locations in by_paragraph.values():
+            if all(location.text_node is not None for location in locations):
+                # Fast path: setiap placeholder ada utuh dalam satu w:t
+                self._replace_in_text_nodes(locations, replacements, matcher)
+            else:
+                self._replace_in_paragraph(paragraph, replacements, matcher)
 
-            # Footers
-            for paragraph in section.footer.paragraphs:
-                self._replace_in_paragraph(paragraph, replacements)
+        self._reindex_paragraphs(paragraph for paragraph, _ in by_paragraph.values())
 
-    def _replace_in_paragraph(self, paragraph: Paragraph, replacements: Dict[str, str]):
+    @staticmethod
+    def _single_text_node(run: Run, run_text: str):
+        """
+        w:t yang memuat seluruh teks run, atau None jika teks run terdiri dari
+        beberapa w:t / tab / break (offset dalam run tidak sama dengan offset w:t)
+
+        Args:
+            run: Run yang diperiksa
+            run_text: run.text
+
+        Returns:
+            Element w:t atau None
+        """
+        nodes = run._r.findall(W_T)
+        if len(nodes) == 1 and (nodes[0].text or '') == run_text:
+            return nodes[0]
+        return None
+
+    @staticmethod
+    def _replace_in_text_nodes(locations: List[PlaceholderLocation],
+                               replacements: Dict[str, str], matcher: PlaceholderMatcher):
+        """
+        Fast path: ganti placeholder langsung di teks w:t tempatnya berada,
+        tanpa membaca formatting atau membuat run baru
+
+        Args:
+            locations: Lokasi placeholder dalam satu paragraph (semua punya text_node)
+            replacements: Dictionary mapping placeholder -> nilai pengganti
+            matcher: Matcher untuk key replacements
+        """
+        done = set()
+        for location in locations:
+            node = location.text_node
+            if id(node) not in done:
+                done.add(id(node))
+                set_text(node, matcher.sub(node.text or '', replacements))
+
+    def _replace_in_paragraph(self, paragraph: Paragraph, replacements: Dict[str, str],
+                              matcher: PlaceholderMatcher = None):
         """
         Mengganti placeholder dalam satu paragraph dengan mempertahankan formatting
 
         Args:
             paragraph: Paragraph object dari python-docx
             replacements: Dictionary mapping placeholder -> nilai pengganti
+            matcher: Matcher untuk key replacements (dibuat jika tidak diberikan)
         """
+        if matcher is None:
+            matcher = PlaceholderHandler.get_matcher(replacements)
+
         # Build full text to detect placeholders that may span multiple runs
-        full_text = ''.join(run.text for run in paragraph.runs)
-
-        # Check if there are any placeholders
-        if not PlaceholderHandler.find_placeholders(full_text):
-            return  # No placeholders, nothing to replace
-
-        # Find all placeholders and their positions
-        placeholder_matches = []
-        for placeholder, value in replacements.items():
-            pattern = r'\$\{' + re.escape(placeholder) + r'\}'
-            for match in re.finditer(pattern, full_text):
-                placeholder_matches.append({
-                    'start': match.start(),
-                    'end': match.end(),
-                    'placeholder': placeholder,
-                    'value': value,
-                    'original': match.group()
-                })
-
-        if not placeholder_matches:
+        runs = paragraph.runs
+        run_texts = [run.text for run in runs]
+        full_text = ''.join(run_texts)
+
+        # Find all placeholders and their positions in one pass (sorted by position)
+        matches = list(matcher.finditer(full_text))
+        if not matches:
             return  # No matches to replace
 
-        # Sort by position
-        placeholder_matches.sort(key=lambda x: x['start'])
-
-        # Build new runs with preserved formatting
-        new_runs_data = []
-        current_pos = 0
-        run_position = 0
-
-        for run in paragraph.runs:
-            run_start = run_position
-            run_end = run_position + len(run.text)
-            run_text = run.text
-
-            # Check if this run contains any part of placeholders
-            run_segments = []
-            segment_start = 0
-
-            for match in placeholder_matches:
-                match_start = match['start']
-                match_end = match['end']
-
-                # Check if placeholder overlaps with this run
-                if match_start < run_end and match_end > run_start:
-                    # Calculate the portion of placeholder in this run
-                    local_match_start = max(0, match_start - run_start)
-                    local_match_end = min(len(run_text), match_end - run_start)
-
-                    # Add text before placeholder (if any)
-                    if segment_start < local_match_start:
-                        run_segments.append({
-                            'text': run_text[segment_start:local_match_start],
-                            'is_replacement': False
-                        })
-
-                    # Check if this is the run where placeholder starts
-                    if match_start >= run_start and match_start < run_end:
-                        # This run contains the start of the placeholder, do replacement here
-                        run_segments.append({
-                            'text': match['value'],
-                            'is_replacement': True
-                        })
-
-                    segment_start = local_match_end
-
-            # Add remaining text in run
-            if segment_start < len(run_text):
-                run_segments.append({
-                    'text': run_text[segment_start:],
-                    'is_replacement': False
-                })
-
-            # Store run data with formatting
-            if run_segments:
-                for segment in run_segments:
-                    if segment['text']:  # Only add non-empty segments
-                        new_runs_data.append({
-                            'text': segment['text'],
-                            'bold': run.bold,
-                            'italic': run.italic,
-                            'underline': run.underline,
-                            'font_name': run.font.name,
-                            'font_size': run.font.size,
-                            'font_color': run.font.color.rgb if run.font.color.rgb else None,
-                        })
-
-            run_position = run_end
-
-        # Clear all existing runs
-        for i in range(len(paragraph.runs) - 1, -1, -1):
-            paragraph._element.remove(paragraph.runs[i]._element)
-
-        # Add new runs with preserved formatting
-        for run_data in new_runs_data:
-            new_run = paragraph.add_run(run_data['text'])
-
-            # Apply formatting
-            if run_data['bold'] is not None:
-                new_run.bold = run_data['bold']
-            if run_data['italic'] is not None:
-                new_run.italic = run_data['italic']
-            if run_data['underline'] is not None:
-                new_run.underline = run_data['underline']
-            if run_data['font_name']:
-                new_run.font.name = run_data['font_name']
-            if run_data['font_size']:
-                new_run.font.size = run_data['font_size']
-            if run_data['font_color']:
-                new_run.font.color.rgb = run_data['font_color']
-
-    def save(self, output_path: str):
+        # Satu sweep maju: run dan match (urut posisi) dijalani bersamaan.
+        # Run yang tidak tersentuh placeholder dibiarkan apa adanya.
+        first = 0
+        run_start = 0
+        for run, run_text in zip(runs, run_texts):
+            run_end = run_start + len(run_text)
+
+            # Lewati match yang sudah selesai sebelum run ini
+            while first < len(matches) and matches[first].end() <= run_start:
+                first += 1
+
+            segments = []
+            cursor = 0
+            current = first
+            inside = True  # Semua placeholder di run ini mulai dan selesai di run ini
+            while current < len(matches) and matches[current].start() < run_end:
+                match = matches[current]
+                inside = inside and match.start() >= run_start and match.end() <= run_end
+                local_start = max(0, match.start() - run_start)
+                local_end = min(len(run_text), match.end() - run_start)
+
+                # Add text before placeholder (if any)
+                if cursor < local_start:
+                    segments.append(run_text[cursor:local_start])
+
+                # Nilai ditaruh di run tempat placeholder dimulai
+                if match.start() >= run_start:
+                    segments.append(replacements[match.group(1)])
+
+                cursor = local_end
+                current += 1
+
+            if current > first:
+                # Add remaining text in run
+                if cursor < len(run_text):
+                    segments.append(run_text[cursor:])
+
+                # Run rebuild hanya untuk placeholder yang terpecah ke beberapa run
+                node = self._single_text_node(run, run_text) if inside else None
+                if node is not None:
+                    set_text(node, ''.join(segments))
+                else:
+                    self._splice_run(paragraph, run, segments)
+
+            run_start = run_end
+
+    @staticmethod
+    def _splice_run(paragraph: Paragraph, run: Run, segments: List[str]):
+        """
+        Ganti satu run dengan run baru per segment, di posisi yang sama.
+        Setiap run baru mendapat salinan w:rPr run asli, sehingga semua
+        formatting (termasuk highlight, character style, font East Asian) ikut.
+
+        Args:
+            paragraph: Paragraph tempat run berada
+            run: Run yang berisi (sebagian) placeholder
+            segments: Teks pengganti isi run, sesuai urutan
+        """
+        rPr = run._r.rPr
+
+        for text in segments:
+            if not text:  # Only add non-empty segments
+                continue
+
+            new_r = OxmlElement('w:r')
+            if rPr is not None:
+                new_r.append(deepcopy(rPr))
+            run._r.addprevious(new_r)
+            Run(new_r, paragraph).text = text
+
+        run._r.getparent().remove(run._r)
+
+    def save(self, output_path: Union[str, BinaryIO]):
         """
         Simpan dokumen ke file
 
         Args:
-            output_path: Path output file
+            output_path: Path output file, atau file-like object (misalnya BytesIO)
+                         supaya dokumen tidak perlu ditulis ke disk
+        """
+        if not self.document:
+            return
+
+        # Salin member yang tidak berubah langsung dari isi template yang diload
+        # (tanpa deflate ulang)
+        self._write_package(RawCopyWriter(output_path, BytesIO(self._source), self._baseline))
+
+    def _write_package(self, writer):
         """
-        if self.document:
-            self.document.save(output_path)
+        Tulis package dokumen ke writer, urutan sama dengan Document.save
 
-    def replace_image_placeholders(self, image_replacements: Dict[str, str],
-                                   width_inches: float = 3.0) -> Tuple[int, List[str]]:
+        Args:
+            writer: Object dengan interface PhysPkgWriter (write dan close)
+        """
+        package = self.document.part.package
+        parts = list(package.parts)
+        for part in parts:
+            part.before_marshal()
+
+        PackageWriter._write_content_types_stream(writer, parts)
+        PackageWriter._write_pkg_rels(writer, package.rels)
+        PackageWriter._write_parts(writer, parts)
+        writer.close()
+
+    def replace_image_placeholders(self, image_replacements: Dict[str, ImageSource],
+                                   width_inches: float = 3.0,
+                                   max_workers: int = None) -> Tuple[int, List[str]]:
         """
-        Mengganti image placeholder dengan actual images
+        Mengganti image placeholder dengan actual images.
+        Semua image (terutama URL) di-resolve bersamaan lebih dulu, lalu
+        disisipkan dalam satu kali jalan lewat index placeholder.
 
         Args:
             image_replacements: Dictionary mapping placeholder -> image path/URL
+                                atau isi image (bytes/BytesIO)
             width_inches: Lebar default image dalam inches
+            max_workers: Batas download bersamaan (default: ImageHandler.MAX_CONCURRENT_DOWNLOADS)
 
         Returns:
             Tuple (success_count, error_messages)
@@ -312,101 +622,258 @@ class DocxHandler:
         if not self.document:
             return 0, ["Document not loaded"]
 
-        success_count = 0
         errors = []
-        temp_files = []
-
+        self._build_index()
+
+        # Get and validate semua image sekaligus (download URL bersamaan)
+        resolved = ImageHandler.get_image_sources(image_replacements, max_workers)
+
+        # Image dibaca dan diparse sekali, dipakai untuk semua paragraph
+        images: Dict[str, Union[Image, Exception]] = {}
+        for placeholder, (source, error) in resolved.items():
+            if error:
+                errors.append(f"{placeholder}: {error}")
+                continue
+            try:
+                images[placeholder] = ImageHandler.load_image(source, width_inches)
+            except Exception as e:
+                images[placeholder] = e
+
+        # Setiap paragraph mendapat placeholder pertama (urutan image_replacements)
+        # yang ada di dalamnya; hanya paragraph yang tercatat di index yang dikunjungi
+        targets: Dict[int, Tuple[Paragraph, str]] = {}
+        for placeholder in images:
+            for location in self._image_index.get(placeholder, ()):
+                targets.setdefault(id(location.paragraph._p), (location.paragraph, placeholder))
+
+        replaced = set()
         try:
-            for placeholder, image_path in image_replacements.items():
-                # Get and validate image path
-                final_path, is_temp, error = ImageHandler.get_image_path(image_path)
-
-                if error:
-                    errors.append(f"{placeholder}: {error}")
-                    continue
-
-                if is_temp:
-                    temp_files.append(final_path)
-
-                # Replace in paragraphs
-                replaced = self._replace_image_in_paragraphs(
-                    self.document.paragraphs,
-                    placeholder,
-                    final_path,
-                    width_inches
-                )
-
-                # Replace in tables
-                for table in self.document.tables:
-                    for row in table.rows:
-                        for cell in row.cells:
-                            replaced += self._replace_image_in_paragraphs(
-                                cell.paragraphs,
-                                placeholder,
-                                final_path,
-                                width_inches
-                            )
-
-                # Replace in headers and footers
-                for section in self.document.sections:
-                    # Headers
-                    replaced += self._replace_image_in_paragraphs(
-                        section.header.paragraphs,
-                        placeholder,
-                        final_path,
-                        width_inches
-                    )
-
-                    # Footers
-                    replaced += self._replace_image_in_paragraphs(
-                        section.footer.paragraphs,
-                        placeholder,
-                        final_path,
-                        width_inches
-                    )
-
-                if replaced > 0:
-                    success_count += 1
-
+            for paragraph, placeholder in targets.values():
+                if self._replace_image_in_paragraph(paragraph, placeholder,
+                                                    images[placeholder], width_inches):
+                    replaced.add(placeholder)
         finally:
-            # Cleanup temp files
-            for temp_file in temp_files:
-                ImageHandler.cleanup_temp_file(temp_file)
+            self._reindex_paragraphs(paragraph for paragraph, _ in targets.values())
 
-        return success_count, errors
+        return len(replaced), errors
 
-    def _replace_image_in_paragraphs(self, paragraphs, placeholder: str,
-                                     image_path: str, width_inches: float) -> int:
+    def _replace_image_in_paragraph(self, paragraph: Paragraph, placeholder: str,
+                                    image: Union[Image, Exception],
+                                    width_inches: float) -> bool:
         """
-        Replace image placeholder dalam list of paragraphs
+        Ganti isi paragraph yang berisi image placeholder dengan image
 
         Args:
-            paragraphs: List of paragraphs
+            paragraph: Paragraph yang berisi placeholder
             placeholder: Nama placeholder
-            image_path: Path ke image file
+            image: Image dari ImageHandler.load_image, atau exception jika gagal diload
             width_inches: Lebar image
 
         Returns:
-            Number of replacements made
+            True jika image berhasil disisipkan
         """
-        replacements = 0
-        pattern = r'@\{' + re.escape(placeholder) + r'\}'
+        # Clear paragraph text
+        paragraph.text = ""
 
-        for paragraph in paragraphs:
-            if re.search(pattern, paragraph.text):
-                # Clear paragraph text
-                paragraph.text = ""
+        # Add image
+        if isinstance(image, Exception):
+            paragraph.text = f"@{{{placeholder}}} [Error: {str(image)}]"
+            return False
+        try:
+            self._add_picture(paragraph, image, width_inches)
+            return True
+        except Exception as e:
+            # If failed, restore placeholder with error note
+            paragraph.text = f"@{{{placeholder}}} [Error: {str(e)}]"
+            return False
+
+    def _add_picture(self, paragraph: Paragraph, image: Image, width_inches: float):
+        """
+        Sama seperti paragraph.add_run().add_picture(), tapi memakai Image yang
+        sudah diload dan image part yang dicari lewat SHA1 (tanpa hash ulang
+        semua image part di package setiap kali)
+
+        Args:
+            paragraph: Paragraph tujuan
+            image: Image dari ImageHandler.load_image
+            width_inches: Lebar image
+        """
+        part = paragraph.part
+        rId = part.relate_to(self._get_or_add_image_part(image), RT.IMAGE)
+        cx, cy = image.scaled_dimensions(Inches(width_inches), None)
+        inline = CT_Inline.new_pic_inline(part.next_id, rId, image.filename, cx, cy)
+        paragraph.add_run()._r.add_drawing(inline)
+
+    def _get_or_add_image_part(self, image: Image) -> ImagePart:
+        """
+        Image part dengan isi yang sama dengan image, dibuat jika belum ada,
+        sehingga satu image hanya disimpan sekali per dokumen output
 
-                # Add image
-                try:
-                    run = paragraph.add_run()
-                    run.add_picture(image_path, width=Inches(width_inches))
-                    replacements += 1
-                except Exception as e:
-                    # If failed, restore placeholder with error note
-                    paragraph.text = f"@{{{placeholder}}} [Error: {str(e)}]"
+        Args:
+            image: Image yang akan disisipkan
+
+        Returns:
+            ImagePart dalam package dokumen
+        """
+        image_parts = self.document.part.package.image_parts
+        if self._image_parts is None:
+            # Image bawaan template cukup di-hash sekali per load
+            self._image_parts = {part.sha1: part for part in image_parts}
+
+        part = self._image_parts.get(image.sha1)
+        if part is None:
+            part = image_parts._add_image_part(image)
+            self._image_parts[image.sha1] = part
+        return part
+
+    def compile(self) -> CompiledTemplate:
+        """
+        Compile file template untuk render berulang (misalnya mail merge).
+        Template diparse sekali per load; setiap render hanya menggabungkan potongan XML.
+
+        Returns:
+            CompiledTemplate dari file yang sedang diload
+        """
+        with self._compile_lock:
+            if self._compiled is None:
+                self._compiled = CompiledTemplate(BytesIO(self._source))
+            return self._compiled
+
+    def render(self, text_values: Dict[str, str], image_values: Dict[str, ImageSource] = None,
+               width_inches: float = 3.0, errors: List[str] = None) -> bytes:
+        """
+        Render template yang diload menjadi isi file DOCX.
+        Berbeda dengan replace_placeholders, self.document tidak diubah, sehingga
+        method ini aman dipanggil bersamaan dari banyak thread.
 
-        return replacements
+        Args:
+            text_values: Dictionary mapping text placeholder -> nilai
+            image_values: Dictionary mapping image placeholder -> image path/URL
+                          atau isi image (bytes/BytesIO)
+            width_inches: Lebar image dalam inches
+            errors: Jika diberikan, error image ditambahkan ke list ini
+
+        Returns:
+            Isi file DOCX dalam bytes
+        """
+        return render(self.compile(), text_values, image_values, width_inches, errors)
+
+    def render_batch(self, rows: List[Dict[str, str]], output_dir: str,
+                     width_inches: float = 3.0, workers: int = 1,
+                     chunk_size: int = 16,
+                     progress: Callable[[int, int], None] = None) -> List[Dict[str, any]]:
+        """
+        Render banyak dokumen (mail merge) dari template yang sedang diload.
+        Template di-compile sekali (sekali per worker process) lalu setiap
+        baris dirender tanpa load ulang dari disk.
+
+        Args:
+            rows: List dictionary placeholder -> value, 1 per dokumen output
+                  (lihat ConfigLoader.load_batch_config)
+            output_dir: Folder tujuan file output
+            width_inches: Lebar image dalam inches
+            workers: Jumlah worker process (1 = tanpa process pool,
+                     None = sejumlah CPU core)
+            chunk_size: Jumlah baris yang dikirim ke worker sekaligus
+            progress: Dipanggil dengan (jumlah selesai, total) setiap satu baris
+                      selesai, dari thread pemanggil
+
+        Returns:
+            List status per baris: {'row', 'output', 'status', 'message'},
+            urutan sama dengan rows
+        """
+        if not self.document:
+            return []
+
+        template = self.compile()
+        image_placeholders = template.find_all_placeholders_with_types()[1]
+        used_names = set()
+        jobs = []
+
+        for row_number, row in enumerate(rows, start=1):
+            values = dict(row)
+            pattern = values.pop(ConfigLoader.OUTPUT_COLUMN, '')
+
+            text_values = {}
+            image_values = {}
+            for placeholder, value in values.items():
+                if placeholder in image_placeholders:
+                    if value.strip():
+                        image_values[placeholder] = value
+                else:
+                    text_values[placeholder] = value
+
+            output_path = os.path.join(
+                output_dir,
+                self._batch_output_name(pattern, text_values, row_number, used_names)
+            )
+            jobs.append((row_number, output_path, text_values, image_values))
+
+        workers = workers or os.cpu_count() or 1
+        workers = min(workers, len(jobs))
+
+        if workers <= 1:
+            # Image baris berikutnya di-resolve di background selagi baris ini dirender
+            prefetched = prefetch_images((job[3] for job in jobs), width_inches=width_inches)
+            results = (
+                _render_batch_job(template, job, width_inches, resolved)
+                for job, resolved in zip(jobs, prefetched)
+            )
+            return self._collect_batch_results(results, len(jobs), progress)
+
+        # Worker compile template sendiri sekali saat start, lalu dipakai untuk semua chunk
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_batch_worker,
+            initargs=(self._source, width_inches, ImageHandler.processor, ImageHandler.cache)
+        ) as executor:
+            results = (
+                _merge_worker_stats(result, stats) for result, stats in
+                executor.map(_run_batch_job, jobs, chunksize=max(1, chunk_size))
+            )
+            return self._collect_batch_results(results, len(jobs), progress)
+
+    @staticmethod
+    def _collect_batch_results(results: Iterable[Dict[str, any]], total: int,
+                               progress: Callable[[int, int], None] = None
+                               ) -> List[Dict[str, any]]:
+        """Kumpulkan status baris batch sambil melaporkan progress"""
+        collected = []
+        for result in results:
+            collected.append(result)
+            if progress is not None:
+                progress(len(collected), total)
+        return collected
+
+    def _batch_output_name(self, pattern: str, text_values: Dict[str, str],
+                           row_number: int, used_names: Set[str]) -> str:
+        """
+        Buat nama file output untuk satu baris batch
+
+        Args:
+            pattern: Pola nama file (boleh berisi ${placeholder}), kosong = default
+            text_values: Nilai text placeholder baris ini
+            row_number: Nomor baris (mulai dari 1)
+            used_names: Nama yang sudah dipakai baris sebelumnya (diupdate)
+
+        Returns:
+            Nama file .docx yang unik dalam batch
+        """
+        default_name = f"{Path(self.file_path).stem}_{row_number}"
+        name = PlaceholderHandler.replace_all_placeholders(pattern, text_values) if pattern else ''
+        name = re.sub(r'[\\/:*?"<>|]+', '_', name).strip() or default_name
+
+        if not name.lower().endswith('.docx'):
+            name += '.docx'
+        # Nama dengan suffix juga bisa sudah dipakai (pola 'x', 'x_3', 'x')
+        stem = name[:-5]
+        suffix = row_number
+        while name.lower() in used_names:
+            name = f"{stem}_{suffix}.docx"
+            suffix += 1
+        used_names.add(name.lower())
+
+        return name
 
     def get_document_info(self) -> Dict[str, any]:
         """
@@ -423,3 +890,91 @@ class DocxHandler:
             'tables': len(self.document.tables),
             'sections': len(self.document.sections),
         }
+
+
+# Template per worker process untuk render_batch (diisi oleh _init_batch_worker)
+_worker_template: Optional[CompiledTemplate] = None
+_worker_width_inches: float = 3.0
+
+
+def _init_batch_worker(source: bytes, width_inches: float,
+                       processor: Optional[ImageProcessor] = None,
+                       cache: Optional[ImageCache] = None):
+    """
+    Initializer worker process: compile template sekali per process. Konfigurasi
+    ImageHandler dikirim eksplisit, karena dengan start method spawn/forkserver
+    worker tidak mewarisi perubahan class attribute dari process utama.
+    """
+    global _worker_template, _worker_width_inches
+    _worker_template = CompiledTemplate(BytesIO(source))
+    _worker_width_inches = width_inches
+    ImageHandler.processor = processor
+    ImageHandler.cache = cache
+
+
+def _image_stats() -> Tuple[Optional[Dict[str, int]], Optional[Dict[str, int]]]:
+    """Statistik image cache dan image pipeline process ini (None jika tidak aktif)"""
+    cache, processor = ImageHandler.cache, ImageHandler.processor
+    return (
+        cache.stats() if cache is not None else None,
+        processor.stats() if processor is not None else None,
+    )
+
+
+def _run_batch_job(job: tuple) -> Tuple[Dict[str, any], tuple]:
+    """
+    Render satu baris batch di worker process
+
+    Returns:
+        Tuple (status baris, selisih statistik image cache dan pipeline
+        selama baris ini), supaya statistik di process utama tetap lengkap
+    """
+    before = _image_stats()
+    result = _render_batch_job(_worker_template, job, _worker_width_inches)
+    deltas = tuple(
+        None if old is None else {name: new[name] - old[name] for name in old}
+        for old, new in zip(before, _image_stats())
+    )
+    return result, deltas
+
+
+def _merge_worker_stats(result: Dict[str, any], deltas: tuple) -> Dict[str, any]:
+    """Tambahkan statistik image dari worker ke ImageHandler process utama"""
+    for target, delta in zip((ImageHandler.cache, ImageHandler.processor), deltas):
+        if target is not None and delta:
+            target.add_stats(delta)
+    return result
+
+
+def _render_batch_job(template: CompiledTemplate, job: tuple, width_inches: float,
+                      resolved: Tuple[Dict[str, object], List[str]] = None) -> Dict[str, any]:
+    """
+    Render satu baris batch ke file
+
+    Args:
+        template: CompiledTemplate yang dipakai
+        job: Tuple (row_number, output_path, text_values, image_values)
+        width_inches: Lebar image dalam inches
+        resolved: Image baris ini yang sudah di-prefetch (opsional)
+
+    Returns:
+        Status baris: {'row', 'output', 'status', 'message'}
+    """
+    row_number, output_path, text_values, image_values = job
+    try:
+        errors = template.render_to_file(
+            output_path, text_values, image_values, width_inches, resolved
+        )
+        return {
+            'row': row_number,
+            'output': output_path,
+            'status': 'warning' if errors else 'success',
+            'message': "; ".join(errors),
+        }
+    except Exception as e:
+        return {
+            'row': row_number,
+            'output': output_path,
+            'status': 'error',
+            'message': str(e),
+        }
@@ -0,0 +1,314 @@
+"""
+Module HTTP client untuk download image
+Koneksi keep-alive di-pool per host, body response di-stream per chunk
+langsung ke file tujuan, dengan batas ukuran, retry + backoff, dan batas
+jumlah request bersamaan per host. Hanya memakai standard library.
+"""
+import http.client
+import os
+import socket
+import ssl
+import threading
+import time
+import weakref
+from typing import BinaryIO, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+
+_REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+_MAX_REDIRECTS = 5
+# Body response error/redirect yang dibuang supaya koneksi bisa dipakai lagi;
+# body yang lebih besar tidak dibaca, koneksinya ditutup
+_MAX_DISCARD_BYTES = 64 * 1024
+
+# Error jaringan yang layak dicoba ulang (koneksi keep-alive bisa sudah ditutup server)
+_RETRY_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.IncompleteRead,
+    http.client.BadStatusLine,
+    ConnectionError,
+    socket.timeout,
+    TimeoutError,
+)
+
+
+# Semua client yang hidup, supaya pool-nya bisa dikosongkan di child process setelah fork
+_clients: "weakref.WeakSet[HttpClient]" = weakref.WeakSet()
+
+
+def _reset_clients_after_fork():
+    for client in list(_clients):
+        client._reset_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_clients_after_fork)
+
+
+class HttpError(Exception):
+    """Response dengan status error (4xx/5xx)"""
+
+    def __init__(self, status: int, reason: str):
+        super().__init__(f"HTTP Error {status}: {reason}")
+        self.status = status
+        self.reason = reason
+
+
+class ResponseTooLarge(Exception):
+    """Body response melewati batas max_bytes"""
+
+
+class TooManyRedirects(Exception):
+    """Redirect melewati batas _MAX_REDIRECTS"""
+
+
+class HttpClient:
+    """
+    HTTP client dengan connection pool per host (scheme, host, port).
+    Aman dipakai dari banyak thread sekaligus.
+    """
+
+    def __init__(self, max_per_host: int = 4, timeout: float = 30,
+                 max_bytes: int = 50 * 1024 * 1024, retries: int = 3,
+                 backoff: float = 0.5, chunk_size: int = 64 * 1024,
+                 user_agent: str = None):
+        """
+        Args:
+            max_per_host: Maksimal request bersamaan (dan koneksi) per host
+            timeout: Timeout default per koneksi dalam detik
+            max_bytes: Ukuran body maksimal
+            retries: Jumlah percobaan ulang untuk error jaringan / status 429 dan 5xx
+            backoff: Jeda awal retry dalam detik (dikali 2 setiap percobaan)
+            chunk_size: Ukuran chunk saat streaming body
+            user_agent: Header User-Agent
+        """
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.retries = retries
+        self.backoff = backoff
+        self.chunk_size = chunk_size
+        self.user_agent = user_agent
+        self._lock = threading.Lock()
+        self._idle: Dict[Tuple[str, str, int], List[http.client.HTTPConnection]] = {}
+        self._slots: Dict[Tuple[str, str, int], threading.BoundedSemaphore] = {}
+        self._ssl_context = ssl.create_default_context()
+        _clients.add(self)
+
+    # ------------------------------------------------------------------
+    # Connection pool
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _host_key(url: str) -> Tuple[str, str, int]:
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        return parts.scheme, parts.hostname, port
+
+    def _slot(self, key: Tuple[str, str, int]) -> threading.BoundedSemaphore:
+        with self._lock:
+            if key not in self._slots:
+                self._slots[key] = threading.BoundedSemaphore(self.max_per_host)
+            return self._slots[key]
+
+    def _acquire(self, key: Tuple[str, str, int],
+                 timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        """Ambil koneksi idle dari pool, atau buat baru. Returns (koneksi, reused)"""
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                connection = idle.pop()
+                connection.timeout = timeout
+                if connection.sock is not None:
+                    connection.sock.settimeout(timeout)
+                return connection, True
+        return self._new_connection(key, timeout), False
+
+    def _new_connection(self, key: Tuple[str, str, int],
+                        timeout: float) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        if scheme == 'https':
+            return http.client.HTTPSConnection(
+                host, port, timeout=timeout, context=self._ssl_context
+            )
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def _release(self, key: Tuple[str, str, int], connection: http.client.HTTPConnection):
+        """Kembalikan koneksi keep-alive ke pool"""
+        with self._lock:
+            self._idle.setdefault(key, []).append(connection)
+
+    def _reset_after_fork(self):
+        """
+        Dipanggil di child process setelah fork: koneksi idle milik parent
+        (socket yang sama) tidak boleh dipakai bersama, jadi pool dimulai dari kosong.
+        Referensi ke socket warisan cukup dilepas; koneksi parent tetap utuh.
+        """
+        self._lock = threading.Lock()
+        self._idle = {}
+        self._slots = {}
+
+    def close(self):
+        """Tutup semua koneksi idle"""
+        with self._lock:
+            connections = [c for idle in self._idle.values() for c in idle]
+            self._idle.clear()
+        for connection in connections:
+            connection.close()
+
+    # ------------------------------------------------------------------
+    # Request
+    # ------------------------------------------------------------------
+
+    def get(self, url: str, destination: BinaryIO, headers: Dict[str, str] = None,
+            timeout: float = None) -> Tuple[int, Mapping[str, str]]:
+        """
+        GET url dan stream body ke destination. Redirect diikuti otomatis.
+
+        Args:
+            url: URL http/https
+            destination: File tujuan (mode binary). Jika seekable, isinya
+                         dikosongkan lagi sebelum retry.
+            headers: Header tambahan
+            timeout: Timeout dalam detik (default: self.timeout)
+
+        Returns:
+            Tuple (status code, response headers). 304 dikembalikan apa adanya
+            (body tidak ditulis).
+
+        Raises:
+            HttpError: Status 4xx/5xx (setelah retry habis untuk 429/5xx)
+            ResponseTooLarge: Body melewati max_bytes
+        """
+        timeout = timeout or self.timeout
+        request_headers = {'Accept': '*/*'}
+        if self.user_agent:
+            request_headers['User-Agent'] = self.user_agent
+        request_headers.update(headers or {})
+
+        for _ in range(_MAX_REDIRECTS + 1):
+            status, response_headers = self._get_with_retry(
+                url, destination, request_headers, timeout
+            )
+            if status not in _REDIRECT_STATUSES:
+                return status, response_headers
+            url = urljoin(url, response_headers.get('Location', ''))
+
+        raise TooManyRedirects(f"Too many redirects (max {_MAX_REDIRECTS})")
+
+    def _get_with_retry(self, url: str, destination: BinaryIO, headers: Dict[str, str],
+                        timeout: float) -> Tuple[int, Mapping[str, str]]:
+        """Satu request (tanpa mengikuti redirect) dengan retry + backoff"""
+        start_position = destination.tell() if destination.seekable() else None
+        attempt = 0
+        while True:
+            try:
+                status, response_headers = self._get_once(url, destination, headers, timeout)
+                if status not in _RETRY_STATUSES or attempt >= self.retries:
+                    break
+                delay = self._retry_after(response_headers)
+            except _RETRY_ERRORS:
+                # Body yang terpotong hanya bisa dibuang jika destination seekable
+                if attempt >= self.retries or start_position is None:
+                    raise
+                delay = None
+
+            if start_position is not None:
+                destination.seek(start_position)
+                destination.truncate()
+
+            if delay is None:
+                delay = self.backoff * (2 ** attempt)
+            time.sleep(min(delay, self.timeout))
+            attempt += 1
+
+        if status >= 400:
+            raise HttpError(status, http.client.responses.get(status, ''))
+        return status, response_headers
+
+    @staticmethod
+    def _retry_after(headers: Mapping[str, str]) -> Optional[float]:
+        value = headers.get('Retry-After', '')
+        return float(value) if value.isdigit() else None
+
+    def _get_once(self, url: str, destination: BinaryIO, headers: Dict[str, str],
+                  timeout: float) -> Tuple[int, Mapping[str, str]]:
+        """Kirim satu request lewat koneksi dari pool dan stream body-nya"""
+        key = self._host_key(url)
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        with self._slot(key):
+            connection, reused = self._acquire(key, timeout)
+            try:
+                try:
+                    connection.request('GET', path, headers=headers)
+                    response = connection.getresponse()
+                except _RETRY_ERRORS:
+                    if not reused:
+                        raise
+                    # Koneksi idle sudah ditutup server, ulangi sekali dengan koneksi baru
+                    connection.close()
+                    connection, reused = self._new_connection(key, timeout), False
+                    connection.request('GET', path, headers=headers)
+                    response = connection.getresponse()
+
+                status = response.status
+                reusable = True
+                if 200 <= status < 300:
+                    self._stream_body(response, destination)
+                else:
+                    reusable = self._discard_body(response)
+
+                if response.will_close or not reusable:
+                    connection.close()
+                else:
+                    self._release(key, connection)
+                return status, response.headers
+
+            except BaseException:
+                connection.close()
+                raise
+
+    def _discard_body(self, response: http.client.HTTPResponse) -> bool:
+        """
+        Buang body response error/redirect, maksimal _MAX_DISCARD_BYTES
+
+        Returns:
+            True jika body habis dibaca (koneksi boleh dipakai lagi), False jika
+            body lebih besar dari batas dan koneksi harus ditutup
+        """
+        length = response.getheader('Content-Length')
+        if length and length.isdigit() and int(length) > _MAX_DISCARD_BYTES:
+            return False
+
+        discarded = 0
+        while discarded <= _MAX_DISCARD_BYTES:
+            chunk = response.read(self.chunk_size)
+            if not chunk:
+                return True
+            discarded += len(chunk)
+        return False
+
+    def _stream_body(self, response: http.client.HTTPResponse, destination: BinaryIO):
+        """Tulis body per chunk, berhenti jika melewati max_bytes"""
+        length = response.getheader('Content-Length')
+        if length and length.isdigit() and int(length) > self.max_bytes:
+            raise ResponseTooLarge(
+                f"Response too large: {int(length)} bytes (max {self.max_bytes})"
+            )
+
+        received = 0
+        while True:
+            chunk = response.read(self.chunk_size)
+            if not chunk:
+                break
+            received += len(chunk)
+            if received > self.max_bytes:
+                raise ResponseTooLarge(f"Response too large (max {self.max_bytes} bytes)")
+            destination.write(chunk)
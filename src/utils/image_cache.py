@@ -0,0 +1,252 @@
+"""
+Module untuk cache image hasil download di disk
+Image dari URL disimpan per URL dan dipakai ulang antar render (dan antar
+process), dengan batas ukuran (LRU) dan revalidasi ETag/Last-Modified.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'docx-replacer' / 'images'
+
+
+class ImageCache:
+    """
+    Cache image di disk, key = URL.
+
+    Satu entry terdiri dari file isi (<key><ext>) dan metadata (<key>.json).
+    Semua file ditulis ke file sementara lalu di-rename (atomic), sehingga
+    folder cache yang sama aman dipakai bersamaan oleh beberapa process.
+    Urutan LRU memakai mtime file isi, yang diperbarui setiap kali entry dipakai.
+    """
+
+    def __init__(self, directory: str = None, max_bytes: int = 512 * 1024 * 1024,
+                 max_age: float = 3600):
+        """
+        Args:
+            directory: Folder cache (default: env DOCX_REPLACER_IMAGE_CACHE
+                       atau ~/.cache/docx-replacer/images)
+            max_bytes: Batas total ukuran cache, entry terlama dihapus jika lewat
+            max_age: Umur entry (detik) sebelum perlu revalidasi ke server
+        """
+        self.directory = Path(
+            directory or os.environ.get('DOCX_REPLACER_IMAGE_CACHE') or DEFAULT_CACHE_DIR
+        )
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.evicted = 0
+        self._lock = threading.Lock()
+        self._url_locks: Dict[str, threading.Lock] = {}
+
+    def __getstate__(self):
+        # Dikirim ke worker process (render_batch): cukup konfigurasinya
+        return {'directory': str(self.directory), 'max_bytes': self.max_bytes,
+                'max_age': self.max_age}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Statistik cache untuk process ini
+
+        Returns:
+            Dictionary {'hits', 'misses', 'revalidated', 'evicted'}
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'revalidated': self.revalidated,
+                'evicted': self.evicted,
+            }
+
+    def add_stats(self, stats: Dict[str, int]):
+        """
+        Tambahkan statistik dari process lain (worker render_batch)
+
+        Args:
+            stats: Dictionary dengan key yang sama seperti stats()
+        """
+        for name, amount in stats.items():
+            self._count(name, amount)
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def _paths(self, url: str) -> Tuple[Path, Path]:
+        """Path file isi dan metadata untuk URL"""
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        suffix = Path(urlsplit(url).path).suffix.lower()
+        if not suffix or len(suffix) > 6:
+            suffix = '.img'
+        return self.directory / f"{key}{suffix}", self.directory / f"{key}.json"
+
+    def _read_meta(self, meta_path: Path) -> Optional[Dict[str, any]]:
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_atomic(self, path: Path, write):
+        """Tulis file lewat file sementara di folder yang sama lalu rename"""
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def _write_meta(self, meta_path: Path, meta: Dict[str, any]):
+        data = json.dumps(meta).encode('utf-8')
+        self._write_atomic(meta_path, lambda f: f.write(data))
+
+    def fetch(self, url: str, download, timeout: int = 30) -> Tuple[Optional[str], str]:
+        """
+        Ambil image dari cache, download (atau revalidasi) jika perlu
+
+        Args:
+            url: URL image
+            download: Callable (url, headers, destination file, timeout) ->
+                      (status_code, response headers); status 304 berarti
+                      entry cache masih valid dan destination tidak ditulis
+            timeout: Timeout dalam detik
+
+        Returns:
+            Tuple (path file di cache, error_message)
+        """
+        # Thread lain yang meminta URL yang sama menunggu, lalu memakai hasilnya
+        with self._lock:
+            url_lock = self._url_locks.setdefault(url, threading.Lock())
+        with url_lock:
+            return self._fetch(url, download, timeout)
+
+    def _fetch(self, url: str, download, timeout: int) -> Tuple[Optional[str], str]:
+        content_path, meta_path = self._paths(url)
+        meta = self._read_meta(meta_path)
+        cached = meta is not None and meta.get('url') == url and content_path.exists()
+
+        if cached and time.time() - meta.get('checked', 0) < self.max_age:
+            self._touch(content_path)
+            self._count('hits')
+            return str(content_path), ""
+
+        headers = {}
+        if cached:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+            # Download ke file sementara, entry lama tetap utuh sampai rename
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    status, response_headers = download(url, headers, f, timeout)
+                if status == 304 and cached:
+                    os.unlink(temp_path)
+                else:
+                    os.replace(temp_path, content_path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.unlink(temp_path)
+                raise
+
+        except Exception as e:
+            if cached:
+                # Server tidak bisa dihubungi: pakai entry lama
+                self._touch(content_path)
+                self._count('hits')
+                return str(content_path), ""
+            return None, f"Failed to download image: {str(e)}"
+
+        if status == 304 and cached:
+            meta['checked'] = time.time()
+            self._count('hits')
+            self._count('revalidated')
+        else:
+            meta = {
+                'url': url,
+                'etag': response_headers.get('ETag'),
+                'last_modified': response_headers.get('Last-Modified'),
+                'size': content_path.stat().st_size,
+                'checked': time.time(),
+            }
+            self._count('misses')
+
+        self._write_meta(meta_path, meta)
+        self._touch(content_path)
+        if status != 304:
+            self._evict(keep=content_path)
+        return str(content_path), ""
+
+    @staticmethod
+    def _touch(path: Path):
+        """Tandai entry sebagai baru dipakai (urutan LRU)"""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _evict(self, keep: Path = None):
+        """
+        Hapus entry yang paling lama tidak dipakai sampai total ukuran <= max_bytes
+
+        Args:
+            keep: Entry yang tidak boleh dihapus (baru saja dipakai)
+        """
+        entries = []
+        total = 0
+        for path in self.directory.iterdir():
+            if path.suffix == '.json' or path.name.startswith('.tmp-'):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # Sudah dihapus process lain
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+                path.with_suffix('.json').unlink()
+            except OSError:
+                pass
+            total -= size
+            self._count('evicted')
+
+    def clear(self):
+        """Hapus semua entry cache"""
+        if not self.directory.exists():
+            return
+        for path in self.directory.iterdir():
+            try:
+                path.unlink()
+            except OSError:
+                pass
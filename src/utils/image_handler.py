@@ -1,17 +1,55 @@
 """
 Module untuk handling image operations - download dan load images
 """
+import hashlib
 import os
 import tempfile
+import threading
+import warnings
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 from pathlib import Path
-from typing import Tuple, Optional
-import urllib.request
-import urllib.error
+from typing import BinaryIO, Dict, Mapping, Tuple, Optional, Union
+
+from docx.image.image import Image
+
+from .image_cache import ImageCache
+from .image_processor import ImageProcessor
+from .http_client import HttpClient, HttpError, TooManyRedirects
+
+
+# Source image: path lokal, URL, atau isi image yang sudah ada di memory
+ImageSource = Union[str, bytes, BinaryIO]
+
+# Image yang sudah diload: (path atau SHA1 isi, mtime_ns, size, lebar pixel target) -> Image.
+# Dibatasi total ukuran blob (image yang dipakai beberapa key dihitung per key)
+_LOADED_CACHE_BYTES = 64 * 1024 * 1024
+_loaded_images: "OrderedDict[Tuple[str, int, int, Optional[int]], Image]" = OrderedDict()
+_loaded_size = 0
+# Image per SHA1 isi file, supaya isi yang sama dari path lain tidak diparse ulang
+_images_by_sha1: "weakref.WeakValueDictionary[str, Image]" = weakref.WeakValueDictionary()
+_loaded_lock = threading.Lock()
 
 
 class ImageHandler:
     """Handler untuk operasi image - local files dan URLs"""
 
+    MAX_CONCURRENT_DOWNLOADS = 8  # Default jumlah download bersamaan
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+    # Cache download di disk, opt-in (None = selalu download ke memory, tanpa file sementara)
+    cache: Optional[ImageCache] = None
+
+    # HTTP client bersama: koneksi keep-alive dipakai ulang antar download
+    http_client = HttpClient(
+        max_per_host=4, max_bytes=50 * 1024 * 1024, retries=3, user_agent=USER_AGENT
+    )
+
+    # Resize/recompress sebelum disisipkan (None = image disisipkan apa adanya)
+    processor: Optional[ImageProcessor] = None
+
     @staticmethod
     def is_url(path: str) -> bool:
         """
@@ -26,40 +64,74 @@ class ImageHandler:
         return path.startswith(('http://', 'https://'))
 
     @staticmethod
-    def download_image(url: str, timeout: int = 30) -> Tuple[Optional[str], str]:
+    def download_image_bytes(url: str, timeout: int = 30) -> Tuple[Optional[bytes], str]:
         """
-        Download image dari URL ke temporary file
+        Download image dari URL ke memory
 
         Args:
             url: URL image
             timeout: Timeout dalam detik
 
         Returns:
-            Tuple (temp_file_path, error_message)
+            Tuple (isi image, error_message)
         """
         try:
-            # Create temporary file
-            suffix = Path(url).suffix or '.jpg'
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-            temp_path = temp_file.name
-            temp_file.close()
+            buffer = BytesIO()
+            ImageHandler.fetch_url(url, {}, buffer, timeout)
+            return buffer.getvalue(), ""
 
-            # Download image
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            request = urllib.request.Request(url, headers=headers)
+        except (HttpError, TooManyRedirects, OSError) as e:
+            return None, f"Failed to download image: {str(e)}"
+        except Exception as e:
+            return None, f"Error downloading image: {str(e)}"
 
-            with urllib.request.urlopen(request, timeout=timeout) as response:
-                with open(temp_path, 'wb') as f:
-                    f.write(response.read())
+    @staticmethod
+    def download_image(url: str, timeout: int = 30) -> Tuple[Optional[str], str]:
+        """
+        Download image dari URL ke temporary file.
+        Deprecated: pakai download_image_bytes (tanpa file sementara).
 
-            return temp_path, ""
+        Args:
+            url: URL image
+            timeout: Timeout dalam detik
+
+        Returns:
+            Tuple (temp_file_path, error_message); hapus dengan cleanup_temp_file
+        """
+        warnings.warn(
+            "ImageHandler.download_image is deprecated, use download_image_bytes",
+            DeprecationWarning, stacklevel=2
+        )
+        content, error = ImageHandler.download_image_bytes(url, timeout)
+        if error:
+            return None, error
 
-        except urllib.error.URLError as e:
+        try:
+            suffix = Path(url).suffix or '.jpg'
+            fd, temp_path = tempfile.mkstemp(suffix=suffix)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            return temp_path, ""
+        except OSError as e:
             return None, f"Failed to download image: {str(e)}"
-        except Exception as e:
-            return None, f"Error downloading image: {str(e)}"
+
+    @staticmethod
+    def fetch_url(url: str, headers: Dict[str, str], destination: BinaryIO,
+                  timeout: int = 30) -> Tuple[int, Mapping[str, str]]:
+        """
+        Request GET ke URL dan tulis body response ke destination
+
+        Args:
+            url: URL image
+            headers: Header tambahan (misalnya If-None-Match)
+            destination: File tujuan (mode binary)
+            timeout: Timeout dalam detik
+
+        Returns:
+            Tuple (status code, response headers, case-insensitive). Status 304 = tidak berubah
+            (body tidak ditulis); status error lain dilempar sebagai exception.
+        """
+        return ImageHandler.http_client.get(url, destination, headers, timeout)
 
     @staticmethod
     def validate_image_path(path: str) -> Tuple[bool, str]:
@@ -97,36 +169,190 @@ class ImageHandler:
 
         return True, ""
 
+    @staticmethod
+    def get_image_source(source: ImageSource) -> Tuple[Optional[Union[str, bytes]], str]:
+        """
+        Get image siap diload - download jika URL, validasi jika local.
+        Tidak ada temporary file: URL tanpa cache disk didownload ke memory.
+
+        Args:
+            source: Path atau URL ke image, atau isi image (bytes / file-like object)
+
+        Returns:
+            Tuple (path file atau isi image dalam bytes, error_message)
+        """
+        # Image yang sudah ada di memory dipakai apa adanya
+        if hasattr(source, 'read'):
+            source.seek(0)
+            source = source.read()
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            if not source:
+                return None, "Image data is empty"
+            return bytes(source), ""
+
+        # Validate first
+        is_valid, error = ImageHandler.validate_image_path(source)
+        if not is_valid:
+            return None, error
+
+        # If URL, ambil dari cache (download jika belum ada/berubah)
+        if ImageHandler.is_url(source) and ImageHandler.cache is not None:
+            return ImageHandler.cache.fetch(source, ImageHandler.fetch_url)
+
+        # If URL, download ke memory
+        if ImageHandler.is_url(source):
+            return ImageHandler.download_image_bytes(source)
+
+        # Local file - return as is
+        return source, ""
+
     @staticmethod
     def get_image_path(path: str) -> Tuple[Optional[str], bool, str]:
         """
-        Get valid image path - download jika URL, validasi jika local
+        Get valid image path - download jika URL, validasi jika local.
+        Deprecated: pakai get_image_source (URL didownload ke memory).
 
         Args:
             path: Path atau URL ke image
 
         Returns:
-            Tuple (final_path, is_temp_file, error_message)
+            Tuple (final_path, is_temp_file, error_message); temp file dihapus
+            dengan cleanup_temp_file
         """
-        # Validate first
+        warnings.warn(
+            "ImageHandler.get_image_path is deprecated, use get_image_source",
+            DeprecationWarning, stacklevel=2
+        )
         is_valid, error = ImageHandler.validate_image_path(path)
         if not is_valid:
             return None, False, error
 
-        # If URL, download
-        if ImageHandler.is_url(path):
+        if not ImageHandler.is_url(path):
+            return path, False, ""
+
+        if ImageHandler.cache is not None:
+            cached_path, error = ImageHandler.cache.fetch(path, ImageHandler.fetch_url)
+            return cached_path, False, error
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', DeprecationWarning)
             temp_path, error = ImageHandler.download_image(path)
-            if error:
-                return None, False, error
-            return temp_path, True, ""
+        return temp_path, temp_path is not None, error
 
-        # Local file - return as is
-        return path, False, ""
+    @staticmethod
+    def get_image_sources(sources: Dict[str, ImageSource], max_workers: int = None
+                          ) -> Dict[str, Tuple[Optional[Union[str, bytes]], str]]:
+        """
+        Get banyak image sekaligus. URL didownload bersamaan lewat thread pool,
+        dan source yang sama hanya diproses sekali (hasilnya dipakai bersama).
+
+        Args:
+            sources: Dictionary key (misalnya placeholder) -> path, URL, atau isi image
+            max_workers: Batas download bersamaan (default: MAX_CONCURRENT_DOWNLOADS)
+
+        Returns:
+            Dictionary key -> (path atau bytes, error_message), urutan sama dengan sources
+        """
+        unique = list(dict.fromkeys(sources.values()))
+        urls = [
+            source for source in unique
+            if isinstance(source, str) and ImageHandler.is_url(source)
+        ]
+        max_workers = max_workers or ImageHandler.MAX_CONCURRENT_DOWNLOADS
+
+        results = {}
+        if len(urls) > 1 and max_workers > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+                results.update(zip(urls, executor.map(ImageHandler.get_image_source, urls)))
+
+        # Local file (dan URL jika tidak perlu thread pool) langsung di thread ini
+        for source in unique:
+            if source not in results:
+                results[source] = ImageHandler.get_image_source(source)
+
+        return {key: results[source] for key, source in sources.items()}
+
+    @staticmethod
+    def prepare_image(source: Union[str, bytes], width_inches: float) -> Union[str, bytes]:
+        """
+        Siapkan image untuk disisipkan dengan lebar tertentu (lihat processor)
+
+        Args:
+            source: Path ke image file atau isi image (hasil get_image_source)
+            width_inches: Lebar image di dokumen dalam inches
+
+        Returns:
+            Source asli, atau isi image hasil proses
+        """
+        processor = ImageHandler.processor
+        if processor is None:
+            return source
+
+        blob = processor.process(source, width_inches)
+        return source if blob is None else blob
+
+    @staticmethod
+    def load_image(source: Union[str, bytes], width_inches: float = 3.0) -> Image:
+        """
+        Load image siap disisipkan (lihat prepare_image). Hasilnya di-cache per
+        file dan per isi (SHA1), sehingga image yang sama, misalnya logo di setiap
+        baris batch, hanya dibaca, di-hash, dan diparse header-nya sekali.
+
+        Args:
+            source: Path ke image file atau isi image (hasil get_image_source)
+            width_inches: Lebar image di dokumen dalam inches
+
+        Returns:
+            Object Image python-docx (dimensi, content type, isi, SHA1)
+
+        Raises:
+            Exception: File tidak bisa dibaca atau format image tidak dikenal
+        """
+        global _loaded_size
+        processor = ImageHandler.processor
+        target = processor.target_pixels(width_inches) if processor is not None else None
+        if isinstance(source, str):
+            stat = os.stat(source)
+            key = (os.path.abspath(source), stat.st_mtime_ns, stat.st_size, target)
+        else:
+            key = (hashlib.sha1(source).hexdigest(), None, len(source), target)
+
+        with _loaded_lock:
+            image = _loaded_images.get(key)
+            if image is not None:
+                _loaded_images.move_to_end(key)
+                return image
+
+        prepared = ImageHandler.prepare_image(source, width_inches)
+        if isinstance(prepared, str):
+            with open(prepared, 'rb') as f:
+                blob = f.read()
+            filename = os.path.basename(prepared)
+        else:
+            blob = prepared
+            filename = None  # python-docx memberi nama image.<ext>
+
+        sha1 = key[0] if blob is source else hashlib.sha1(blob).hexdigest()
+        with _loaded_lock:
+            image = _images_by_sha1.get(sha1)
+        if image is None:
+            image = Image._from_stream(BytesIO(blob), blob, filename)
+            with _loaded_lock:
+                image = _images_by_sha1.setdefault(sha1, image)
+
+        with _loaded_lock:
+            if key not in _loaded_images and len(image.blob) <= _LOADED_CACHE_BYTES:
+                _loaded_images[key] = image
+                _loaded_size += len(image.blob)
+                while _loaded_size > _LOADED_CACHE_BYTES:
+                    _, evicted = _loaded_images.popitem(last=False)
+                    _loaded_size -= len(evicted.blob)
+        return image
 
     @staticmethod
     def cleanup_temp_file(path: str):
         """
-        Cleanup temporary file
+        Cleanup temporary file (hasil download_image / get_image_path)
 
         Args:
             path: Path ke temporary file
@@ -0,0 +1,164 @@
+"""
+Module untuk memproses image sebelum disisipkan ke dokumen
+Image diperkecil ke ukuran pixel yang dibutuhkan lebar target pada DPI
+tertentu, dikompres ulang (JPEG/PNG), dan format yang kurang didukung Word
+(misalnya WebP) dikonversi. Hasil di-cache per isi file dan ukuran target.
+"""
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from typing import Dict, Optional, Tuple, Union
+
+
+class ImageProcessor:
+    """
+    Pipeline resize + recompress image. Pillow diimport saat pertama dipakai,
+    sehingga pipeline ini hanya butuh Pillow jika benar-benar diaktifkan.
+    Aman dipakai dari banyak thread sekaligus.
+    """
+
+    # Format yang ditampilkan Word apa adanya (MPO = JPEG dari kamera/HP)
+    NATIVE_FORMATS = {'JPEG', 'MPO', 'PNG', 'GIF'}
+
+    # Format lossless: hasil konversi/resize tetap PNG supaya tidak blur
+    LOSSLESS_FORMATS = {'PNG', 'GIF', 'BMP', 'ICO'}
+
+    def __init__(self, dpi: int = 150, jpeg_quality: int = 85, max_entries: int = 128):
+        """
+        Args:
+            dpi: Resolusi target; lebar pixel = lebar inches x dpi
+            jpeg_quality: Kualitas JPEG hasil kompres ulang (1-95)
+            max_entries: Jumlah hasil proses yang disimpan di cache memory
+        """
+        self.dpi = dpi
+        self.jpeg_quality = jpeg_quality
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.saved_bytes = 0
+        self._lock = threading.Lock()
+        self._cache: 'OrderedDict[Tuple[str, int], Optional[bytes]]' = OrderedDict()
+
+    def __getstate__(self):
+        # Dikirim ke worker process (render_batch): cukup konfigurasinya
+        return {'dpi': self.dpi, 'jpeg_quality': self.jpeg_quality,
+                'max_entries': self.max_entries}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Statistik pipeline untuk process ini
+
+        Returns:
+            Dictionary {'hits', 'misses', 'saved_bytes'}
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'saved_bytes': self.saved_bytes}
+
+    def add_stats(self, stats: Dict[str, int]):
+        """
+        Tambahkan statistik dari process lain (worker render_batch)
+
+        Args:
+            stats: Dictionary dengan key yang sama seperti stats()
+        """
+        with self._lock:
+            for name, amount in stats.items():
+                setattr(self, name, getattr(self, name) + amount)
+
+    def target_pixels(self, width_inches: float) -> int:
+        """Lebar pixel yang dibutuhkan untuk lebar width_inches"""
+        return max(1, math.ceil(width_inches * self.dpi))
+
+    def process(self, source: Union[str, bytes], width_inches: float) -> Optional[bytes]:
+        """
+        Proses image untuk lebar tertentu
+
+        Args:
+            source: Path ke image file atau isi image
+            width_inches: Lebar image di dokumen dalam inches
+
+        Returns:
+            Isi image hasil proses, atau None jika file asli sudah optimal
+            (atau tidak bisa diproses) dan sebaiknya dipakai apa adanya
+        """
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                data = f.read()
+        else:
+            data = source
+
+        key = (hashlib.sha1(data).hexdigest(), self.target_pixels(width_inches))
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+
+        try:
+            result = self._process(data, key[1])
+        except Exception:
+            # Pillow tidak ada atau format tidak dikenal: biarkan python-docx yang menangani
+            result = None
+
+        with self._lock:
+            self.misses += 1
+            if result is not None:
+                self.saved_bytes += len(data) - len(result)
+            self._cache[key] = result
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return result
+
+    def _process(self, data: bytes, target_width: int) -> Optional[bytes]:
+        """Resize/convert/recompress satu image. Returns None jika tidak perlu diubah"""
+        from PIL import Image, ImageOps
+
+        with Image.open(BytesIO(data)) as source:
+            source_format = source.format
+            convert = source_format not in self.NATIVE_FORMATS
+
+            # GIF animasi hanya boleh dipakai apa adanya (resize menghilangkan animasi)
+            if getattr(source, 'is_animated', False) and not convert:
+                return None
+            # Orientasi EXIF bisa menukar lebar dan tinggi, jadi cek keduanya
+            if max(source.size) <= target_width and not convert:
+                return None
+
+            # JPEG besar cukup di-decode pada skala yang mendekati target
+            source.draft(source.mode, (target_width, target_width))
+            image = ImageOps.exif_transpose(source)
+
+            if image.width > target_width:
+                height = max(1, round(image.height * target_width / image.width))
+                image = image.resize((target_width, height), Image.LANCZOS)
+            elif not convert:
+                return None
+
+            has_alpha = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+            output = BytesIO()
+            if has_alpha or source_format in self.LOSSLESS_FORMATS:
+                output_format = 'PNG'
+                if image.mode not in ('1', 'L', 'LA', 'P', 'RGB', 'RGBA'):
+                    image = image.convert('RGBA' if has_alpha else 'RGB')
+                options = {'optimize': True}
+            else:
+                output_format = 'JPEG'
+                if image.mode not in ('L', 'RGB'):
+                    image = image.convert('RGB')
+                options = {'quality': self.jpeg_quality, 'optimize': True}
+
+            # Profil warna hanya valid jika color mode tidak berubah (misalnya bukan CMYK -> RGB)
+            if image.mode == source.mode and source.info.get('icc_profile'):
+                options['icc_profile'] = source.info['icc_profile']
+            image.save(output, output_format, dpi=(self.dpi, self.dpi), **options)
+
+        result = output.getvalue()
+        # Resize tanpa konversi yang hasilnya justru lebih besar: pakai file asli
+        if not convert and len(result) >= len(data):
+            return None
+        return result
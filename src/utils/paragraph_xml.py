@@ -0,0 +1,270 @@
+"""
+Module untuk operasi placeholder langsung pada XML paragraph (w:p) via lxml
+Dipakai oleh engine yang tidak membangun object Paragraph/Run python-docx.
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+
+from lxml import etree
+
+from .placeholder import PlaceholderMatcher
+
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+NSMAP = {'w': W_NS}
+
+W_P = '{%s}p' % W_NS
+W_R = '{%s}r' % W_NS
+W_T = '{%s}t' % W_NS
+W_TAB = '{%s}tab' % W_NS
+W_BR = '{%s}br' % W_NS
+W_CR = '{%s}cr' % W_NS
+W_PPR = '{%s}pPr' % W_NS
+W_RPR = '{%s}rPr' % W_NS
+W_PROOF_ERR = '{%s}proofErr' % W_NS
+XML_SPACE = '{http://www.w3.org/XML/1998/namespace}space'
+
+_SPECIAL_CHARS = re.compile(r'(\r\n|\n|\r|\t)')
+
+# (w:t element atau None untuk tab/break, start, end) dalam teks gabungan run
+TextNode = Tuple[Optional[etree._Element], int, int]
+
+
+def collect_text_nodes(paragraph: etree._Element) -> Tuple[List[TextNode], str]:
+    """
+    Kumpulkan potongan teks dari run langsung paragraph (sama seperti Run.text)
+
+    Args:
+        paragraph: Element w:p
+
+    Returns:
+        Tuple (list TextNode, teks gabungan)
+    """
+    nodes = []
+    pieces = []
+    position = 0
+    for run in paragraph.iterchildren(W_R):
+        for child in run:
+            tag = child.tag
+            if tag == W_T:
+                piece, node = child.text or '', child
+            elif tag == W_TAB:
+                piece, node = '\t', None
+            elif tag == W_BR or tag == W_CR:
+                piece, node = '\n', None
+            else:
+                continue
+            nodes.append((node, position, position + len(piece)))
+            pieces.append(piece)
+            position += len(piece)
+    return nodes, ''.join(pieces)
+
+
+def paragraph_text(paragraph: etree._Element) -> str:
+    """
+    Teks paragraph termasuk run di dalam hyperlink (sama seperti Paragraph.text)
+
+    Args:
+        paragraph: Element w:p
+
+    Returns:
+        Teks paragraph
+    """
+    return ''.join(paragraph.xpath('./w:r/w:t/text() | ./w:hyperlink/w:r/w:t/text()',
+                                   namespaces=NSMAP))
+
+
+# Setiap placeholder memuat '{', dan karakter itu selalu ada utuh di salah satu w:t.
+# w:p terdekat dari w:t tersebut adalah paragraph yang teksnya memuat '{'.
+_CANDIDATE_PARAGRAPHS = etree.XPath(
+    ".//w:t[contains(., '{')]/ancestor::w:p[1]", namespaces=NSMAP
+)
+
+
+def candidate_paragraphs(root: etree._Element) -> List[etree._Element]:
+    """
+    Paragraph yang mungkin berisi placeholder, dicari dengan satu XPath di
+    level C. Paragraph lain (biasanya hampir semuanya) tidak perlu dibaca teksnya.
+
+    Args:
+        root: Root element story part (misalnya w:document)
+
+    Returns:
+        List element w:p sesuai urutan dokumen, termasuk paragraph dalam tabel,
+        tabel bertingkat, dan text box
+    """
+    return _CANDIDATE_PARAGRAPHS(root)
+
+
+def set_text(node: etree._Element, text: str):
+    """
+    Isi w:t dengan teks baru; newline/tab diubah menjadi w:br/w:tab
+    (sama seperti Run.text setter di python-docx)
+
+    Args:
+        node: Element w:t
+        text: Teks baru
+    """
+    node.text = text
+    node.set(XML_SPACE, 'preserve')
+    if _SPECIAL_CHARS.search(text):
+        _expand_special_chars(node)
+
+
+def _expand_special_chars(node: etree._Element):
+    """Pecah w:t yang berisi newline/tab menjadi w:t + w:br/w:tab + w:t"""
+    parts = _SPECIAL_CHARS.split(node.text or '')
+    node.text = parts[0]
+    previous = node
+    for index in range(1, len(parts), 2):
+        special = etree.Element(W_TAB if parts[index] == '\t' else W_BR)
+        previous.addnext(special)
+        text = etree.Element(W_T)
+        text.set(XML_SPACE, 'preserve')
+        text.text = parts[index + 1]
+        special.addnext(text)
+        previous = text
+
+
+def replace_in_paragraph(paragraph: etree._Element, replacements: Dict[str, str],
+                         matcher: PlaceholderMatcher) -> bool:
+    """
+    Mengganti text placeholder dalam satu w:p dengan mengubah w:t secara langsung.
+    Nilai ditaruh di w:t tempat placeholder dimulai (formatting run itu dipakai),
+    sisa placeholder di w:t berikutnya dihapus. Run lain tidak disentuh.
+
+    Args:
+        paragraph: Element w:p
+        replacements: Dictionary mapping placeholder -> nilai pengganti
+        matcher: Matcher untuk key replacements
+
+    Returns:
+        True jika ada placeholder yang diganti
+    """
+    nodes, full_text = collect_text_nodes(paragraph)
+    if '${' not in full_text:
+        return False
+
+    # node index -> list of (local_start, local_end, value or None)
+    edits: Dict[int, List[Tuple[int, int, Optional[str]]]] = {}
+    first = 0
+    for match in matcher.finditer(full_text):
+        start, end = match.span()
+
+        # Node dan match sama-sama urut, jadi cukup satu sweep maju
+        while first < len(nodes) and nodes[first][2] <= start:
+            first += 1
+        covered = []
+        index = first
+        while index < len(nodes) and nodes[index][1] < end:
+            if nodes[index][2] > nodes[index][1]:
+                covered.append(index)
+            index += 1
+
+        # Placeholder yang melewati tab/break tidak didukung, biarkan apa adanya
+        if not covered or any(nodes[i][0] is None for i in covered):
+            continue
+
+        value = replacements[match.group(1)]
+        for i in covered:
+            node_start = nodes[i][1]
+            edits.setdefault(i, []).append((
+                max(start, node_start) - node_start,
+                min(end, nodes[i][2]) - node_start,
+                value if i == covered[0] else None,
+            ))
+
+    for i, node_edits in edits.items():
+        node = nodes[i][0]
+        text = node.text or ''
+        pieces = []
+        cursor = 0
+        special = False
+        for local_start, local_end, value in node_edits:
+            pieces.append(text[cursor:local_start])
+            if value is not None:
+                pieces.append(value)
+                special = special or _SPECIAL_CHARS.search(value) is not None
+            cursor = local_end
+        pieces.append(text[cursor:])
+
+        node.text = ''.join(pieces)
+        node.set(XML_SPACE, 'preserve')
+        if special:
+            _expand_special_chars(node)
+
+    return bool(edits)
+
+
+def _run_key(run: etree._Element) -> Optional[Tuple]:
+    """
+    Key formatting run untuk merge: atribut run + w:rPr yang diserialisasi.
+    None jika run berisi selain w:rPr/w:t (tab, break, drawing, field, ...)
+    """
+    rPr = None
+    has_text = False
+    for child in run:
+        if child.tag == W_T:
+            has_text = True
+        elif child.tag == W_RPR and rPr is None:
+            rPr = child
+        else:
+            return None
+    if not has_text:
+        return None
+    return (tuple(sorted(run.attrib.items())),
+            etree.tostring(rPr) if rPr is not None else b'')
+
+
+def _merge_runs(parent: etree._Element) -> int:
+    """Gabungkan run bersebelahan dengan formatting sama di bawah parent"""
+    merged = 0
+    previous, previous_key = None, None
+    for child in list(parent):
+        key = _run_key(child) if child.tag == W_R else None
+        if key is not None and key == previous_key:
+            nodes = previous.findall(W_T) + child.findall(W_T)
+            nodes[0].text = ''.join(node.text or '' for node in nodes)
+            nodes[0].set(XML_SPACE, 'preserve')
+            for node in nodes[1:]:
+                if node.getparent() is previous:
+                    previous.remove(node)
+            parent.remove(child)
+            merged += 1
+        else:
+            previous, previous_key = child, key
+    return merged
+
+
+def normalize_part(root: etree._Element) -> Dict[str, int]:
+    """
+    Bersihkan XML story part supaya placeholder tidak terpecah ke banyak run:
+    hapus marker spell-check (w:proofErr) dan atribut revisi w:rsid*, lalu
+    gabungkan run bersebelahan yang formatting-nya sama.
+
+    Args:
+        root: Root element story part (diubah langsung)
+
+    Returns:
+        Dictionary {'proof_errors', 'rsid_attributes', 'runs_merged'}
+    """
+    proof_errors = list(root.iter(W_PROOF_ERR))
+    for element in proof_errors:
+        element.getparent().remove(element)
+
+    rsid_prefix = '{%s}rsid' % W_NS
+    rsid_attributes = 0
+    for element in root.iter(etree.Element):
+        for name in [name for name in element.attrib if name.startswith(rsid_prefix)]:
+            del element.attrib[name]
+            rsid_attributes += 1
+
+    # Parent run bisa w:p, w:hyperlink, w:ins, w:smartTag, ...
+    parents = {id(run.getparent()): run.getparent() for run in root.iter(W_R)}
+    runs_merged = sum(_merge_runs(parent) for parent in parents.values())
+
+    return {
+        'proof_errors': len(proof_errors),
+        'rsid_attributes': rsid_attributes,
+        'runs_merged': runs_merged,
+    }
@@ -3,15 +3,78 @@ Module untuk deteksi dan replacement placeholder
 Format: ${nama_placeholder} untuk text, @{nama_placeholder} untuk image
 """
 import re
-from typing import List, Dict, Set, Tuple
+from functools import lru_cache
+from typing import List, Dict, Set, Tuple, FrozenSet, Iterator
+
+
+class PlaceholderMatcher:
+    """
+    Matcher multi-pattern: menemukan semua placeholder dari satu set nama
+    dalam satu pass regex (satu alternation untuk semua nama)
+    """
+
+    def __init__(self, names: FrozenSet[str], prefix: str = '$'):
+        """
+        Inisialisasi matcher
+
+        Args:
+            names: Set nama placeholder (tanpa wrapper)
+            prefix: Prefix placeholder, '$' untuk text atau '@' untuk image
+        """
+        self.names = names
+        self.prefix = prefix
+
+        if names:
+            # Nama terpanjang dulu supaya alternation tidak berhenti di prefix nama lain
+            alternatives = '|'.join(
+                re.escape(name) for name in sorted(names, key=len, reverse=True)
+            )
+            pattern = re.escape(prefix) + r'\{(' + alternatives + r')\}'
+        else:
+            pattern = r'(?!)'  # Tidak pernah match
+        self.regex = re.compile(pattern)
+
+    def finditer(self, text: str) -> Iterator[re.Match]:
+        """
+        Iterasi semua kemunculan placeholder dalam teks, urut berdasarkan posisi
+
+        Args:
+            text: Teks yang akan dicari
+
+        Returns:
+            Iterator match object; group(1) adalah nama placeholder
+        """
+        return self.regex.finditer(text)
+
+    def sub(self, text: str, replacements: Dict[str, str]) -> str:
+        """
+        Mengganti semua placeholder dalam satu pass
+
+        Args:
+            text: Teks yang berisi placeholder
+            replacements: Dictionary mapping placeholder -> nilai pengganti
+
+        Returns:
+            Teks dengan semua placeholder yang sudah diganti
+        """
+        return self.regex.sub(lambda match: replacements[match.group(1)], text)
+
+
+@lru_cache(maxsize=32)
+def _compile_matcher(names: FrozenSet[str], prefix: str) -> PlaceholderMatcher:
+    return PlaceholderMatcher(names, prefix)
 
 
 class PlaceholderHandler:
     """Handler untuk mengelola placeholder dalam dokumen"""
 
-    TEXT_PLACEHOLDER_PATTERN = r'\$\{([^}]+)\}'
-    IMAGE_PLACEHOLDER_PATTERN = r'@\{([^}]+)\}'
+    # Nama tidak boleh berisi '{' atau '}': '${${nama}' berisi placeholder nama,
+    # sama seperti matcher per key yang dipakai saat replace
+    TEXT_PLACEHOLDER_PATTERN = r'\$\{([^{}]+)\}'
+    IMAGE_PLACEHOLDER_PATTERN = r'@\{([^{}]+)\}'
     PLACEHOLDER_PATTERN = TEXT_PLACEHOLDER_PATTERN  # Backward compatibility
+    TEXT_PLACEHOLDER_REGEX = re.compile(TEXT_PLACEHOLDER_PATTERN)
+    IMAGE_PLACEHOLDER_REGEX = re.compile(IMAGE_PLACEHOLDER_PATTERN)
 
     @staticmethod
     def find_placeholders(text: str) -> Set[str]:
@@ -55,10 +118,22 @@ class PlaceholderHandler:
         Returns:
             Teks dengan semua placeholder yang sudah diganti
         """
-        result = text
-        for placeholder, value in replacements.items():
-            result = PlaceholderHandler.replace_placeholder(result, placeholder, value)
-        return result
+        matcher = PlaceholderHandler.get_matcher(replacements)
+        return matcher.sub(text, replacements)
+
+    @staticmethod
+    def get_matcher(replacements: Dict[str, str], prefix: str = '$') -> PlaceholderMatcher:
+        """
+        Mendapatkan matcher (di-cache) untuk set key dari replacements
+
+        Args:
+            replacements: Dictionary mapping placeholder -> nilai pengganti
+            prefix: Prefix placeholder, '$' untuk text atau '@' untuk image
+
+        Returns:
+            PlaceholderMatcher untuk semua key dalam replacements
+        """
+        return _compile_matcher(frozenset(replacements), prefix)
 
     @staticmethod
     def validate_placeholder_name(name: str) -> bool:
@@ -98,9 +173,12 @@ class PlaceholderHandler:
         Returns:
             Tuple (text_placeholders, image_placeholders)
         """
-        text_placeholders = PlaceholderHandler.find_placeholders(text)
-        image_placeholders = PlaceholderHandler.find_image_placeholders(text)
-        return text_placeholders, image_placeholders
+        # Dua regex terpisah: '@{' yang tidak ditutup tidak boleh menelan ${...}
+        # sesudahnya (dan sebaliknya), sama seperti find_placeholders/find_image_placeholders
+        return (
+            set(PlaceholderHandler.TEXT_PLACEHOLDER_REGEX.findall(text)),
+            set(PlaceholderHandler.IMAGE_PLACEHOLDER_REGEX.findall(text)),
+        )
 
     @staticmethod
     def is_image_placeholder(placeholder_name: str, text: str) -> bool:
@@ -0,0 +1,297 @@
+"""
+Module untuk streaming engine - render dokumen DOCX yang sangat besar
+Main document diproses paragraph demi paragraph dengan lxml iterparse dan
+langsung ditulis ke ZIP output. Container (w:body, tabel, baris, cell, content
+control) juga di-stream, sehingga memory tetap kecil berapa pun ukuran
+dokumen atau tabelnya.
+"""
+import re
+import zipfile
+from contextlib import nullcontext
+from typing import BinaryIO, Dict, List, Set, Tuple, Union
+
+from lxml import etree
+
+from .image_handler import ImageSource
+from .placeholder import PlaceholderHandler, PlaceholderMatcher
+from .paragraph_xml import W_NS, W_P, W_PPR, paragraph_text, replace_in_paragraph
+from .template_engine import RenderSession, resolve_images, story_partnames
+from .zip_package import ZipStreamWriter, compress_member, read_raw_member
+
+
+W_BODY = '{%s}body' % W_NS
+
+# Container yang di-stream: start tag ditulis saat dibuka, child ditulis satu per satu
+_STREAMED_CONTAINERS = {
+    W_BODY,
+    '{%s}tbl' % W_NS,
+    '{%s}tr' % W_NS,
+    '{%s}tc' % W_NS,
+    '{%s}sdt' % W_NS,
+    '{%s}sdtContent' % W_NS,
+}
+
+_XML_DECLARATION = b"<?xml version='1.0' encoding='UTF-8' standalone='yes'?>\n"
+_XMLNS_REGEX = re.compile(rb'\sxmlns(?::[\w.-]+)?="[^"]*"')
+
+
+def _namespace_declarations(nsmap: Dict[str, str]) -> Set[bytes]:
+    """Serialisasi deklarasi namespace seperti yang ditulis lxml"""
+    declarations = set()
+    for prefix, uri in nsmap.items():
+        name = 'xmlns' if prefix is None else f'xmlns:{prefix}'
+        declarations.add(f' {name}="{uri}"'.encode('utf-8'))
+    return declarations
+
+
+def _strip_inherited_namespaces(xml: bytes, inherited: Set[bytes]) -> bytes:
+    """
+    Hapus deklarasi namespace yang sudah ada di root dari start tag pertama.
+    lxml selalu mendeklarasikan ulang semua namespace saat satu subtree
+    diserialisasi, padahal blok ini ditulis di dalam root yang sama.
+    """
+    end = xml.index(b'>')
+    head = _XMLNS_REGEX.sub(
+        lambda match: b'' if match.group(0) in inherited else match.group(0), xml[:end]
+    )
+    return head + xml[end:]
+
+
+def _start_tag(element: etree._Element) -> bytes:
+    """Start tag element (beserta atribut dan deklarasi namespace-nya)"""
+    shallow = etree.Element(element.tag, attrib=dict(element.attrib), nsmap=element.nsmap)
+    return etree.tostring(shallow)[:-2] + b'>'
+
+
+def _end_tag(element: etree._Element) -> bytes:
+    """End tag element"""
+    localname = etree.QName(element).localname
+    name = f'{element.prefix}:{localname}' if element.prefix else localname
+    return f'</{name}>'.encode('utf-8')
+
+
+def _release(element: etree._Element):
+    """Bebaskan element yang sudah diproses beserta sibling sebelumnya"""
+    element.clear()
+    parent = element.getparent()
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
+
+
+class StreamingDocxEngine:
+    """
+    Engine alternatif untuk dokumen sangat besar. Berbeda dengan DocxHandler
+    dan CompiledTemplate, main document tidak pernah dimuat utuh ke memory.
+    Member lain yang tidak berubah disalin mentah dari archive sumber.
+    """
+
+    def __init__(self, file_path: str):
+        """
+        Args:
+            file_path: Path ke file DOCX template
+        """
+        self.file_path = file_path
+
+    @staticmethod
+    def _read_package_info(archive: zipfile.ZipFile) -> Dict[str, bytes]:
+        """Baca rels part dan [Content_Types].xml (kecil) dari archive"""
+        return {
+            info.filename: archive.read(info) for info in archive.infolist()
+            if info.filename.endswith('.rels') or info.filename == '[Content_Types].xml'
+        }
+
+    @staticmethod
+    def _iter_paragraphs(source: BinaryIO):
+        """Iterate semua w:p dalam part secara streaming (paragraph dilepas setelahnya)"""
+        for _, paragraph in etree.iterparse(source, events=('end',), tag=W_P, huge_tree=True):
+            yield paragraph
+            _release(paragraph)
+
+    def find_all_placeholders_with_types(self) -> Tuple[Set[str], Set[str]]:
+        """
+        Menemukan semua placeholder (text dan image) dalam dokumen secara streaming
+
+        Returns:
+            Tuple (text_placeholders, image_placeholders)
+        """
+        text_placeholders = set()
+        image_placeholders = set()
+
+        with zipfile.ZipFile(self.file_path) as archive:
+            blobs = self._read_package_info(archive)
+            for partname in story_partnames(blobs, {}):
+                if partname not in archive.NameToInfo:
+                    continue
+                with archive.open(partname) as source:
+                    for paragraph in self._iter_paragraphs(source):
+                        text, images = PlaceholderHandler.find_all_placeholders_with_type(
+                            paragraph_text(paragraph)
+                        )
+                        text_placeholders.update(text)
+                        image_placeholders.update(images)
+
+        return text_placeholders, image_placeholders
+
+    @staticmethod
+    def _collect_shape_ids(source: BinaryIO) -> Set[int]:
+        """Kumpulkan atribut id numerik dalam part (untuk shape id image baru)"""
+        used_ids = set()
+        for _, element in etree.iterparse(source, events=('end',), huge_tree=True):
+            value = element.get('id')
+            if value is not None and value.isdigit():
+                used_ids.add(int(value))
+            _release(element)
+        return used_ids
+
+    @staticmethod
+    def _process_paragraphs(element: etree._Element, partname: str, used_ids: Set[int],
+                            text_values: Dict[str, str], matcher: PlaceholderMatcher,
+                            session: RenderSession):
+        """
+        Ganti text dan image placeholder di semua w:p dalam element
+
+        Args:
+            element: Blok (atau root part) yang diproses
+            partname: Partname story part tempat element berada
+            used_ids: Shape id yang sudah dipakai di part itu
+            text_values: Dictionary mapping text placeholder -> nilai
+            matcher: Matcher untuk key text_values (None jika kosong)
+            session: RenderSession untuk image
+        """
+        for paragraph in list(element.iter(W_P)):
+            if matcher is not None:
+                replace_in_paragraph(paragraph, text_values, matcher)
+
+            if not session.images:
+                continue
+            name = session.choose_image(
+                PlaceholderHandler.find_image_placeholders(paragraph_text(paragraph))
+            )
+            if name is None:
+                continue
+
+            # Sama seperti paragraph.text = "" + add_picture: pPr dipertahankan
+            start = 1 if len(paragraph) and paragraph[0].tag == W_PPR else 0
+            del paragraph[start:]
+            wrapper = etree.fromstring(
+                f'<w:p xmlns:w="{W_NS}">'
+                + session.image_content_xml(name, partname, used_ids)
+                + '</w:p>'
+            )
+            paragraph.extend(list(wrapper))
+
+    def _stream_part(self, source: BinaryIO, output, partname: str, used_ids: Set[int],
+                     text_values: Dict[str, str], matcher: PlaceholderMatcher,
+                     session: RenderSession):
+        """
+        Proses main document blok demi blok dan tulis langsung ke output
+
+        Args:
+            source: Stream member sumber
+            output: Stream member output (punya method write)
+        """
+        output.write(_XML_DECLARATION)
+        inherited: Set[bytes] = set()
+        # Untuk setiap element yang sedang terbuka: apakah element itu di-stream
+        streamed: List[bool] = []
+
+        for event, element in etree.iterparse(source, events=('start', 'end'), huge_tree=True):
+            if event == 'start':
+                if not streamed:
+                    output.write(_start_tag(element))
+                    inherited = _namespace_declarations(element.nsmap)
+                    streamed.append(True)
+                elif streamed[-1] and element.tag in _STREAMED_CONTAINERS:
+                    output.write(_strip_inherited_namespaces(_start_tag(element), inherited))
+                    streamed.append(True)
+                else:
+                    streamed.append(False)
+                continue
+
+            if streamed.pop():
+                output.write(_end_tag(element))
+                if streamed:
+                    _release(element)
+            elif streamed[-1]:
+                # Satu blok utuh (paragraph, tblPr, sectPr, ...) sudah selesai di-parse
+                self._process_paragraphs(element, partname, used_ids,
+                                         text_values, matcher, session)
+                output.write(_strip_inherited_namespaces(etree.tostring(element), inherited))
+                _release(element)
+
+    def render(self, output_path: Union[str, BinaryIO], text_values: Dict[str, str],
+               image_values: Dict[str, ImageSource] = None,
+               width_inches: float = 3.0) -> List[str]:
+        """
+        Render dokumen dan simpan ke file
+
+        Args:
+            output_path: Path output file atau file-like object (misalnya BytesIO)
+            text_values: Dictionary mapping text placeholder -> nilai
+            image_values: Dictionary mapping image placeholder -> image path/URL
+                          atau isi image (bytes/BytesIO)
+            width_inches: Lebar image dalam inches
+
+        Returns:
+            List error message
+        """
+        errors: List[str] = []
+        images = resolve_images(image_values or {}, errors, width_inches=width_inches)
+        matcher = PlaceholderHandler.get_matcher(text_values) if text_values else None
+
+        output_file = nullcontext(output_path) if hasattr(output_path, 'write') \
+            else open(output_path, 'wb')
+        with open(self.file_path, 'rb') as fileobj, \
+                zipfile.ZipFile(fileobj) as archive, \
+                output_file as output:
+            blobs = self._read_package_info(archive)
+            rel_ids: Dict[str, Set[str]] = {}
+            partnames = story_partnames(blobs, rel_ids)
+            main_part = partnames[0]
+
+            session = RenderSession(blobs, set(archive.NameToInfo), rel_ids, images, width_inches)
+            writer = ZipStreamWriter(output)
+
+            # Rels dan content types baru final setelah semua part diproses
+            deferred = []
+            for info in archive.infolist():
+                name = info.filename
+                if name.endswith('.rels') or name == '[Content_Types].xml':
+                    deferred.append(info)
+                elif name == main_part:
+                    used_ids: Set[int] = set()
+                    if images:
+                        with archive.open(info) as source:
+                            used_ids = self._collect_shape_ids(source)
+                    with archive.open(info) as source, \
+                            writer.open_member(name, info.date_time) as target:
+                        self._stream_part(source, target, name, used_ids,
+                                          text_values, matcher, session)
+                elif name in partnames:
+                    # Header/footer kecil, cukup diproses di memory
+                    root = etree.fromstring(archive.read(info))
+                    used_ids = {int(value) for value in root.xpath('//@id') if value.isdigit()}
+                    self._process_paragraphs(root, name, used_ids, text_values, matcher, session)
+                    blob = etree.tostring(root, encoding='UTF-8', standalone=True)
+                    writer.write_member(compress_member(name, blob, info.compress_type,
+                                                        info.date_time))
+                else:
+                    writer.write_member(read_raw_member(fileobj, info))
+
+            updates = session.package_updates()
+            for info in deferred:
+                blob = updates.pop(info.filename, None)
+                if blob is None:
+                    writer.write_member(read_raw_member(fileobj, info))
+                else:
+                    writer.write_member(compress_member(info.filename, blob, info.compress_type,
+                                                        info.date_time))
+            for partname, blob in updates.items():
+                writer.write_member(compress_member(partname, blob))
+            for member in session.media_members():
+                writer.write_member(member)
+
+            writer.close()
+
+        return errors
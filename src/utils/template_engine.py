@@ -0,0 +1,707 @@
+"""
+Module untuk compiled template - parse DOCX sekali, render berkali-kali
+Template dipecah menjadi potongan XML statis dan slot (text dan image),
+sehingga render cukup menggabungkan string tanpa membangun object python-docx.
+"""
+import os
+import posixpath
+import re
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from io import BytesIO
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from xml.sax.saxutils import escape, quoteattr
+
+from docx.image.image import Image
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml.shape import CT_Inline
+from docx.shared import Inches
+from lxml import etree
+
+from .placeholder import PlaceholderHandler
+from .image_handler import ImageHandler, ImageSource
+from .paragraph_xml import (
+    W_PPR, XML_SPACE, candidate_paragraphs, collect_text_nodes, paragraph_text
+)
+from .zip_package import (
+    RawMember, compress_media, compress_member, read_raw_member, write_package
+)
+
+
+PKG_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+CT_NS = 'http://schemas.openxmlformats.org/package/2006/content-types'
+
+
+# Marker comment yang disisipkan saat compile lalu dipakai untuk memecah XML:
+# T<n> = text slot, C<n> = awal konten paragraph image, E<n> = akhir konten
+_MARKER = '\ue000'  # Private use character, tidak muncul di dokumen normal
+_MARKER_REGEX = re.compile('<!--' + _MARKER + r'([TCE])(\d+)-->')
+
+# Pengganti karakter khusus, sama seperti Run.text setter di python-docx
+_TEXT_BREAK = '</w:t><w:br/><w:t xml:space="preserve">'
+_TEXT_TAB = '</w:t><w:tab/><w:t xml:space="preserve">'
+
+# Karakter di luar range Char XML 1.0 (control character, surrogate), ditolak lxml
+_INVALID_XML_CHARS = re.compile('[^\t\n\r\x20-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]')
+
+
+@dataclass
+class TextSlot:
+    """Slot untuk satu text placeholder (${})"""
+
+    name: str
+    original: str  # Teks placeholder asli, dipakai jika tidak ada nilai
+
+
+@dataclass
+class ImageSlot:
+    """Slot untuk paragraph yang berisi image placeholder (@{})"""
+
+    names: Set[str]
+    body: List[Union[str, TextSlot, 'ImageSlot']] = field(default_factory=list)
+
+
+@dataclass
+class _StoryPart:
+    """Satu story part (document, header, footer) yang sudah di-compile"""
+
+    partname: str
+    segments: List[Union[str, TextSlot, ImageSlot]]
+    used_ids: Set[int]
+
+
+def resolve_images(image_values: Dict[str, ImageSource], errors: List[str],
+                   max_workers: int = None, width_inches: float = 3.0) -> Dict[str, object]:
+    """
+    Resolve semua image source menjadi object Image (atau exception jika gagal dibaca).
+    URL didownload bersamaan, lihat ImageHandler.get_image_sources.
+
+    Args:
+        image_values: Dictionary mapping image placeholder -> image path/URL atau isi image
+        errors: List untuk menampung error message (diupdate)
+        max_workers: Batas download bersamaan (default: ImageHandler.MAX_CONCURRENT_DOWNLOADS)
+        width_inches: Lebar image dalam inches (untuk ImageHandler.load_image)
+
+    Returns:
+        Dictionary placeholder -> Image atau Exception, urutan sama dengan image_values
+    """
+    resolved = ImageHandler.get_image_sources(image_values, max_workers)
+    loaded: Dict[object, object] = {}  # source -> Image atau Exception
+    images = {}
+    for placeholder, (source, error) in resolved.items():
+        if error:
+            errors.append(f"{placeholder}: {error}")
+            continue
+
+        if source not in loaded:
+            try:
+                loaded[source] = ImageHandler.load_image(source, width_inches)
+            except Exception as e:
+                loaded[source] = e
+        images[placeholder] = loaded[source]
+    return images
+
+
+def prefetch_images(image_rows: Iterable[Dict[str, ImageSource]], lookahead: int = 4,
+                    max_workers: int = None,
+                    width_inches: float = 3.0) -> Iterator[Tuple[Dict[str, object], List[str]]]:
+    """
+    Resolve image untuk baris-baris berikutnya di background, selagi baris
+    sekarang dirender (dipakai oleh batch render)
+
+    Args:
+        image_rows: Image values per baris (image placeholder -> path/URL)
+        lookahead: Jumlah baris yang di-resolve lebih dulu
+        max_workers: Batas download bersamaan per baris
+        width_inches: Lebar image dalam inches
+
+    Yields:
+        Tuple (hasil resolve_images, error_messages) per baris, urutan sama dengan image_rows
+    """
+    def resolve(image_values: Dict[str, ImageSource]) -> Tuple[Dict[str, object], List[str]]:
+        errors: List[str] = []
+        return resolve_images(image_values, errors, max_workers, width_inches), errors
+
+    rows = iter(image_rows)
+    with ThreadPoolExecutor(max_workers=max(1, lookahead)) as executor:
+        pending = deque(
+            executor.submit(resolve, image_values)
+            for image_values in islice(rows, max(1, lookahead))
+        )
+        while pending:
+            future = pending.popleft()
+            for image_values in islice(rows, 1):
+                pending.append(executor.submit(resolve, image_values))
+            yield future.result()
+
+
+def rels_name_for(partname: str) -> str:
+    """Nama rels part untuk partname, misalnya word/_rels/document.xml.rels"""
+    directory, filename = posixpath.split(partname)
+    return posixpath.join(directory, '_rels', filename + '.rels')
+
+
+def related_parts(blobs: Dict[str, bytes], partname: str, reltype: str,
+                  rel_ids: Dict[str, Set[str]] = None) -> List[str]:
+    """
+    Cari partname yang direferensikan dari partname dengan tipe tertentu
+
+    Args:
+        blobs: Isi member package (minimal rels part)
+        partname: Partname sumber ('' untuk package root)
+        reltype: Relationship type
+        rel_ids: Jika diberikan, rId yang ditemukan dicatat ke sini
+
+    Returns:
+        List partname target
+    """
+    rels_name = rels_name_for(partname)
+    if rels_name not in blobs:
+        return []
+
+    rels = etree.fromstring(blobs[rels_name])
+    ids = rel_ids.setdefault(rels_name, set()) if rel_ids is not None else set()
+    targets = []
+    for rel in rels.iterchildren('{%s}Relationship' % PKG_REL_NS):
+        ids.add(rel.get('Id'))
+        if rel.get('Type') == reltype and rel.get('TargetMode') != 'External':
+            target = posixpath.normpath(
+                posixpath.join(posixpath.dirname(partname), rel.get('Target'))
+            ).lstrip('/')
+            if target not in targets:
+                targets.append(target)
+    return targets
+
+
+def story_partnames(blobs: Dict[str, bytes], rel_ids: Dict[str, Set[str]]) -> List[str]:
+    """
+    Partname story part yang diproses: main document, header, dan footer
+
+    Args:
+        blobs: Isi member package (minimal rels part)
+        rel_ids: rId yang sudah dipakai di setiap rels part dicatat ke sini
+
+    Returns:
+        List partname, main document lebih dulu
+    """
+    main_part = related_parts(blobs, '', RT.OFFICE_DOCUMENT, rel_ids)[0]
+    partnames = [main_part]
+    partnames += related_parts(blobs, main_part, RT.HEADER, rel_ids)
+    partnames += related_parts(blobs, main_part, RT.FOOTER, rel_ids)
+
+    # Header/footer bisa punya rels sendiri, rId-nya juga harus dihindari
+    for partname in partnames[1:]:
+        related_parts(blobs, partname, RT.IMAGE, rel_ids)
+    return partnames
+
+
+class RenderSession:
+    """State untuk satu kali render: alokasi media, relationship, dan shape id"""
+
+    def __init__(self, blobs: Dict[str, bytes], member_names: Set[str],
+                 rel_ids: Dict[str, Set[str]], images: Dict[str, object],
+                 width_inches: float):
+        """
+        Args:
+            blobs: Isi rels part dan [Content_Types].xml dari template
+            member_names: Nama semua member dalam template
+            rel_ids: Dictionary rels_name -> rId yang sudah dipakai
+            images: Hasil resolve_images
+            width_inches: Lebar image dalam inches
+        """
+        self.blobs = blobs
+        self.rel_ids = rel_ids
+        self.images = images
+        self.width = Inches(width_inches)
+        self.media: Dict[str, Tuple[str, Image]] = {}        # sha1 -> (partname, image)
+        self.used_media = {name for name in member_names if name.startswith('word/media/')}
+        self.new_rels: Dict[str, Dict[str, str]] = {}        # rels_name -> {target: rId}
+        self.used_rids: Dict[str, Set[str]] = {}
+        self.new_extensions: Dict[str, str] = {}
+        self.used_ids: Dict[str, Set[int]] = {}
+
+        content_types = etree.fromstring(blobs['[Content_Types].xml'])
+        self.default_extensions = {
+            default.get('Extension', '').lower()
+            for default in content_types.iterchildren('{%s}Default' % CT_NS)
+        }
+
+    def choose_image(self, names: Set[str]) -> Optional[str]:
+        """
+        Pilih image placeholder untuk paragraph yang berisi names, yaitu yang
+        pertama sesuai urutan image_values (sama seperti DocxHandler)
+
+        Returns:
+            Nama placeholder, atau None jika tidak ada image untuk paragraph ini
+        """
+        return next((name for name in self.images if name in names), None)
+
+    def add_media(self, image: Image) -> str:
+        """
+        Daftarkan image ke package (dedup berdasarkan SHA1): semua pemakaian
+        image yang sama menunjuk ke satu media part
+
+        Returns:
+            Partname media (tanpa leading slash)
+        """
+        if image.sha1 not in self.media:
+            ext = image.ext
+            n = 1
+            while f'word/media/image{n}.{ext}' in self.used_media:
+                n += 1
+            partname = f'word/media/image{n}.{ext}'
+            self.used_media.add(partname)
+            self.media[image.sha1] = (partname, image)
+
+            if ext.lower() not in self.default_extensions:
+                self.new_extensions[ext.lower()] = image.content_type
+
+        return self.media[image.sha1][0]
+
+    def relate_to(self, rels_name: str, target: str) -> str:
+        """
+        Buat relationship image dari story part ke media
+
+        Returns:
+            Relationship id (rIdN)
+        """
+        rels = self.new_rels.setdefault(rels_name, {})
+        if target not in rels:
+            used = self.used_rids.setdefault(rels_name, set(self.rel_ids.get(rels_name, ())))
+            n = 1
+            while f'rId{n}' in used:
+                n += 1
+            used.add(f'rId{n}')
+            rels[target] = f'rId{n}'
+        return rels[target]
+
+    def image_content_xml(self, name: str, partname: str, used_ids: Set[int]) -> str:
+        """
+        XML konten paragraph pengganti image placeholder (tanpa w:pPr),
+        sama seperti hasil paragraph.text = "" + add_picture di DocxHandler
+
+        Args:
+            name: Nama image placeholder yang dipakai
+            partname: Partname story part tempat paragraph berada
+            used_ids: Shape id yang sudah dipakai di story part itu
+
+        Returns:
+            String XML run
+        """
+        image = self.images[name]
+        if isinstance(image, Exception):
+            message = f"@{{{name}}} [Error: {str(image)}]"
+            return f'<w:r><w:t xml:space="preserve">{escape(message)}</w:t></w:r>'
+
+        media_name = self.add_media(image)
+        target = posixpath.relpath(media_name, posixpath.dirname(partname))
+        rId = self.relate_to(rels_name_for(partname), target)
+
+        ids = self.used_ids.setdefault(partname, set(used_ids))
+        shape_id = 1
+        while shape_id in ids:
+            shape_id += 1
+        ids.add(shape_id)
+
+        cx, cy = image.scaled_dimensions(self.width, None)
+        inline = CT_Inline.new_pic_inline(shape_id, rId, image.filename, cx, cy)
+        return ('<w:r/><w:r><w:drawing>'
+                + etree.tostring(inline, encoding='unicode')
+                + '</w:drawing></w:r>')
+
+    def package_updates(self) -> Dict[str, bytes]:
+        """
+        Member package yang berubah karena image: rels dan content types
+        (media baru ada di media_members)
+
+        Returns:
+            Dictionary membername -> isi baru
+        """
+        updates: Dict[str, bytes] = {}
+
+        # Tambahkan relationship image ke rels part
+        for rels_name, targets in self.new_rels.items():
+            entries = ''.join(
+                f'<Relationship Id="{rId}" Type="{RT.IMAGE}" Target={quoteattr(target)}/>'
+                for target, rId in targets.items()
+            )
+            if rels_name in self.blobs:
+                base = self.blobs[rels_name].decode('utf-8')
+                head, tail = base.rsplit('</Relationships>', 1)
+                updates[rels_name] = (head + entries + '</Relationships>' + tail).encode('utf-8')
+            else:
+                updates[rels_name] = (
+                    '<?xml version=\'1.0\' encoding=\'UTF-8\' standalone=\'yes\'?>\n'
+                    f'<Relationships xmlns="{PKG_REL_NS}">{entries}</Relationships>'
+                ).encode('utf-8')
+
+        if self.new_extensions:
+            base = self.blobs['[Content_Types].xml'].decode('utf-8')
+            head, tail = base.rsplit('</Types>', 1)
+            entries = ''.join(
+                f'<Default Extension={quoteattr(ext)} ContentType={quoteattr(content_type)}/>'
+                for ext, content_type in self.new_extensions.items()
+            )
+            updates['[Content_Types].xml'] = (head + entries + '</Types>' + tail).encode('utf-8')
+
+        return updates
+
+    def media_members(self) -> List[RawMember]:
+        """
+        Media part baru dalam bentuk terkompresi (hasil kompres dipakai ulang antar render)
+
+        Returns:
+            List RawMember, satu per image unik
+        """
+        return [
+            compress_media(partname, image.blob, image.sha1)
+            for partname, image in self.media.values()
+        ]
+
+
+class CompiledTemplate:
+    """
+    Template DOCX yang sudah di-compile menjadi potongan XML statis dan slot.
+    Render tidak mengubah template, sehingga satu instance bisa dipakai
+    untuk merender banyak dokumen, termasuk dari beberapa thread sekaligus
+    (semua state render ada di RenderSession milik masing-masing pemanggil).
+    """
+
+    def __init__(self, source):
+        """
+        Compile template DOCX
+
+        Args:
+            source: Path ke file DOCX atau file-like object
+        """
+        self.members: List[RawMember] = []
+        self.blobs: Dict[str, bytes] = {}
+        self.stories: Dict[str, _StoryPart] = {}
+        self.rel_ids: Dict[str, Set[str]] = {}
+        self.member_names: Set[str] = set()
+        self.text_placeholders: Set[str] = set()
+        self.image_placeholders: Set[str] = set()
+
+        fileobj = open(source, 'rb') if isinstance(source, (str, os.PathLike)) else source
+        try:
+            with zipfile.ZipFile(fileobj) as archive:
+                for info in archive.infolist():
+                    self.blobs[info.filename] = archive.read(info)
+                    self.member_names.add(info.filename)
+                    # Data terkompresi disimpan supaya member statis tidak di-deflate ulang
+                    self.members.append(read_raw_member(fileobj, info))
+        finally:
+            if fileobj is not source:
+                fileobj.close()
+
+        self._compile()
+
+        # Setelah compile hanya rels dan content types yang masih dibutuhkan saat render
+        self.blobs = {
+            name: blob for name, blob in self.blobs.items()
+            if name.endswith('.rels') or name == '[Content_Types].xml'
+        }
+
+    # ------------------------------------------------------------------
+    # Compile
+    # ------------------------------------------------------------------
+
+    def _compile(self):
+        """Temukan story part lewat relationship lalu compile masing-masing"""
+        for partname in story_partnames(self.blobs, self.rel_ids):
+            if partname in self.blobs:
+                self.stories[partname] = self._compile_story(partname)
+
+    def _compile_story(self, partname: str) -> _StoryPart:
+        """
+        Compile satu story part menjadi segment statis dan slot
+
+        Args:
+            partname: Partname story part (misalnya word/document.xml)
+
+        Returns:
+            _StoryPart hasil compile
+        """
+        root = etree.fromstring(self.blobs[partname])
+        used_ids = {int(value) for value in root.xpath('//@id') if value.isdigit()}
+
+        text_slots: List[TextSlot] = []
+        image_slots: List[ImageSlot] = []
+
+        for paragraph in candidate_paragraphs(root):
+            self._mark_image_paragraph(paragraph, image_slots)
+            self._mark_text_slots(paragraph, text_slots)
+
+        xml = etree.tostring(root, encoding='UTF-8', standalone=True).decode('utf-8')
+        segments = self._split_segments(xml, text_slots, image_slots)
+
+        return _StoryPart(
+            partname=partname,
+            segments=segments,
+            used_ids=used_ids,
+        )
+
+    def _mark_image_paragraph(self, paragraph, image_slots: List[ImageSlot]):
+        """Tandai konten paragraph yang berisi image placeholder"""
+        names = PlaceholderHandler.find_image_placeholders(paragraph_text(paragraph))
+        if not names:
+            return
+
+        self.image_placeholders.update(names)
+        index = len(image_slots)
+        image_slots.append(ImageSlot(names=names))
+
+        # Konten dimulai setelah w:pPr dan berakhir di child terakhir
+        start = 1 if len(paragraph) and paragraph[0].tag == W_PPR else 0
+        paragraph.insert(start, etree.Comment(f'{_MARKER}C{index}'))
+        paragraph.append(etree.Comment(f'{_MARKER}E{index}'))
+
+    def _mark_text_slots(self, paragraph, text_slots: List[TextSlot]):
+        """
+        Ganti setiap text placeholder di run langsung paragraph dengan marker.
+        Placeholder yang terpecah ke beberapa w:t dipindah utuh ke w:t awal,
+        sama seperti DocxHandler yang menaruh nilai di run tempat placeholder dimulai.
+        """
+        nodes, full_text = collect_text_nodes(paragraph)
+        if '${' not in full_text:
+            return
+
+        # node index -> list of (local_start, local_end, slot index or None)
+        cuts: Dict[int, List[Tuple[int, int, Optional[int]]]] = {}
+        regex = PlaceholderHandler.TEXT_PLACEHOLDER_REGEX
+        for match in regex.finditer(full_text):
+            covered = [
+                i for i, (node, start, end) in enumerate(nodes)
+                if start < match.end() and end > match.start() and end > start
+            ]
+            # Placeholder yang melewati tab/break tidak didukung, biarkan apa adanya
+            if any(nodes[i][0] is None for i in covered):
+                continue
+
+            slot_index = len(text_slots)
+            text_slots.append(TextSlot(name=match.group(1), original=match.group()))
+            self.text_placeholders.add(match.group(1))
+
+            for i in covered:
+                node, start, end = nodes[i]
+                local_start = max(match.start(), start) - start
+                local_end = min(match.end(), end) - start
+                slot = slot_index if i == covered[0] else None
+                cuts.setdefault(i, []).append((local_start, local_end, slot))
+
+        for i, node_cuts in cuts.items():
+            node = nodes[i][0]
+            text = node.text or ''
+            node.text = ''
+            marker = None
+            cursor = 0
+            for local_start, local_end, slot in node_cuts + [(len(text), len(text), None)]:
+                # Teks di luar placeholder masuk ke node.text atau tail marker terakhir
+                if marker is None:
+                    node.text += text[cursor:local_start]
+                else:
+                    marker.tail = (marker.tail or '') + text[cursor:local_start]
+                if slot is not None:
+                    marker = etree.Comment(f'{_MARKER}T{slot}')
+                    node.append(marker)
+                cursor = local_end
+            node.set(XML_SPACE, 'preserve')
+
+    @staticmethod
+    def _split_segments(xml: str, text_slots: List[TextSlot],
+                        image_slots: List[ImageSlot]) -> List[Union[str, TextSlot, ImageSlot]]:
+        """
+        Pecah XML hasil serialisasi menjadi list segment berdasarkan marker
+
+        Returns:
+            List berisi string statis, TextSlot, dan ImageSlot (bersarang)
+        """
+        root: List = []
+        stack = [root]
+        position = 0
+
+        for match in _MARKER_REGEX.finditer(xml):
+            if match.start() > position:
+                stack[-1].append(xml[position:match.start()])
+            position = match.end()
+
+            kind, index = match.group(1), int(match.group(2))
+            if kind == 'T':
+                stack[-1].append(text_slots[index])
+            elif kind == 'C':
+                slot = image_slots[index]
+                stack[-1].append(slot)
+                stack.append(slot.body)
+            else:
+                stack.pop()
+
+        if position < len(xml):
+            root.append(xml[position:])
+
+        return root
+
+    # ------------------------------------------------------------------
+    # Render
+    # ------------------------------------------------------------------
+
+    def find_all_placeholders_with_types(self) -> Tuple[Set[str], Set[str]]:
+        """
+        Menemukan semua placeholder (text dan image) dalam template
+
+        Returns:
+            Tuple (text_placeholders, image_placeholders)
+        """
+        return set(self.text_placeholders), set(self.image_placeholders)
+
+    @staticmethod
+    def _render_text(name: str, value: str) -> str:
+        """
+        Escape nilai untuk w:t, termasuk break dan tab
+
+        Raises:
+            ValueError: Nilai berisi karakter yang tidak valid di XML (sama seperti
+                        lxml saat replace_placeholders), supaya baris batch dilaporkan
+                        error dan tidak menghasilkan file yang tidak bisa dibuka Word
+        """
+        invalid = _INVALID_XML_CHARS.search(value)
+        if invalid:
+            raise ValueError(
+                f"Value for '{name}' contains a character not allowed in XML: "
+                f"{invalid.group()!r}"
+            )
+        value = escape(value)
+        if '\n' in value or '\r' in value or '\t' in value:
+            value = value.replace('\r\n', '\n').replace('\r', '\n')
+            value = value.replace('\n', _TEXT_BREAK).replace('\t', _TEXT_TAB)
+        return value
+
+    def _render_segments(self, segments, story: _StoryPart, values: Dict[str, str],
+                         session: RenderSession, out: List[str]):
+        """Render list segment ke list string output"""
+        for segment in segments:
+            if segment.__class__ is str:
+                out.append(segment)
+            elif segment.__class__ is TextSlot:
+                value = values.get(segment.name)
+                if value is None:
+                    out.append(escape(segment.original))
+                else:
+                    out.append(self._render_text(segment.name, value))
+            else:
+                # Paragraph image: ganti seluruh konten dengan picture run
+                name = session.choose_image(segment.names)
+                if name is None:
+                    self._render_segments(segment.body, story, values, session, out)
+                else:
+                    out.append(session.image_content_xml(name, story.partname, story.used_ids))
+
+    def render(self, text_values: Dict[str, str], image_values: Dict[str, ImageSource] = None,
+               width_inches: float = 3.0,
+               resolved: Tuple[Dict[str, object], List[str]] = None) -> Tuple[bytes, List[str]]:
+        """
+        Render template menjadi dokumen DOCX
+
+        Args:
+            text_values: Dictionary mapping text placeholder -> nilai
+            image_values: Dictionary mapping image placeholder -> image path/URL
+                      atau isi image (bytes/BytesIO)
+            width_inches: Lebar image dalam inches
+            resolved: Image yang sudah di-resolve (lihat prefetch_images);
+                      jika diberikan, image_values tidak dipakai
+
+        Returns:
+            Tuple (isi file DOCX dalam bytes, error_messages)
+        """
+        if resolved is not None:
+            images, errors = resolved[0], list(resolved[1])
+        else:
+            errors: List[str] = []
+            images = resolve_images(image_values or {}, errors, width_inches=width_inches)
+        session = RenderSession(self.blobs, self.member_names, self.rel_ids, images, width_inches)
+
+        # Render story parts
+        rendered: Dict[str, bytes] = {}
+        for partname, story in self.stories.items():
+            out: List[str] = []
+            self._render_segments(story.segments, story, text_values, session, out)
+            rendered[partname] = ''.join(out).encode('utf-8')
+
+        rendered.update(session.package_updates())
+        return self._write_package(rendered, session.media_members()), errors
+
+    def _write_package(self, rendered: Dict[str, bytes], media: List[RawMember]) -> bytes:
+        """
+        Tulis package ZIP: member template (atau versi render-nya) lalu member baru.
+        Member yang tidak berubah disalin dalam bentuk terkompresi apa adanya.
+
+        Args:
+            rendered: Dictionary partname -> isi baru
+            media: Media part baru yang sudah terkompresi
+
+        Returns:
+            Isi file DOCX dalam bytes
+        """
+        members = []
+        for member in self.members:
+            blob = rendered.pop(member.filename, None)
+            if blob is None:
+                members.append(member)
+            else:
+                members.append(compress_member(member.filename, blob,
+                                               date_time=member.date_time))
+        for partname, blob in rendered.items():
+            members.append(compress_member(partname, blob))
+        members.extend(media)
+
+        buffer = BytesIO()
+        write_package(buffer, members)
+        return buffer.getvalue()
+
+    def render_to_file(self, output_path: str, text_values: Dict[str, str],
+                       image_values: Dict[str, ImageSource] = None, width_inches: float = 3.0,
+                       resolved: Tuple[Dict[str, object], List[str]] = None) -> List[str]:
+        """
+        Render template dan simpan ke file
+
+        Args:
+            output_path: Path output file
+            text_values: Dictionary mapping text placeholder -> nilai
+            image_values: Dictionary mapping image placeholder -> image path/URL
+                      atau isi image (bytes/BytesIO)
+            width_inches: Lebar image dalam inches
+            resolved: Image yang sudah di-resolve (lihat prefetch_images)
+
+        Returns:
+            List error message
+        """
+        content, errors = self.render(text_values, image_values, width_inches, resolved)
+        with open(output_path, 'wb') as f:
+            f.write(content)
+        return errors
+
+
+def render(template: CompiledTemplate, text_values: Dict[str, str],
+           image_values: Dict[str, ImageSource] = None, width_inches: float = 3.0,
+           errors: List[str] = None) -> bytes:
+    """
+    Render template menjadi isi file DOCX tanpa mengubah template.
+    Aman dipanggil bersamaan dari banyak thread dengan template yang sama.
+
+    Args:
+        template: CompiledTemplate (lihat DocxHandler.compile)
+        text_values: Dictionary mapping text placeholder -> nilai
+        image_values: Dictionary mapping image placeholder -> image path/URL
+                      atau isi image (bytes/BytesIO)
+        width_inches: Lebar image dalam inches
+        errors: Jika diberikan, error image ditambahkan ke list ini
+
+    Returns:
+        Isi file DOCX dalam bytes
+    """
+    content, render_errors = template.render(text_values, image_values, width_inches)
+    if errors is not None:
+        errors.extend(render_errors)
+    return content
@@ -0,0 +1,359 @@
+"""
+Module untuk baca/tulis package ZIP (DOCX) pada level member mentah
+Member yang tidak berubah bisa disalin byte-per-byte (data terkompresi
+diambil langsung dari archive sumber) tanpa decompress dan deflate ulang.
+"""
+import dataclasses
+import hashlib
+import os
+import struct
+import threading
+import time
+import zipfile
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, List, Tuple
+
+
+_LOCAL_HEADER = struct.Struct('<4sHHHHHIIIHH')
+_CENTRAL_HEADER = struct.Struct('<4sHHHHHHIIIHHHHHII')
+_END_RECORD = struct.Struct('<4sHHHHIIH')
+_DATA_DESCRIPTOR = struct.Struct('<4sIII')
+
+_LOCAL_SIGNATURE = b'PK\x03\x04'
+_CENTRAL_SIGNATURE = b'PK\x01\x02'
+_END_SIGNATURE = b'PK\x05\x06'
+_DATA_DESCRIPTOR_SIGNATURE = b'PK\x07\x08'
+
+_VERSION = 20
+_DATA_DESCRIPTOR_FLAG = 0x08
+_UTF8_FLAG = 0x800
+_MAX_ZIP32 = 0xFFFFFFFF
+
+# Media hasil kompres, dipakai ulang antar dokumen: sha1 -> RawMember
+_MEDIA_CACHE_BYTES = 64 * 1024 * 1024
+_media_cache: "OrderedDict[str, RawMember]" = OrderedDict()
+_media_cache_size = 0
+_media_cache_lock = threading.Lock()
+
+
+@dataclass
+class RawMember:
+    """Member ZIP dalam bentuk terkompresi, siap ditulis ulang apa adanya"""
+
+    filename: str
+    data: bytes            # Data terkompresi
+    crc: int
+    file_size: int         # Ukuran sebelum kompresi
+    compress_type: int
+    date_time: Tuple[int, int, int, int, int, int]
+
+
+def read_raw_member(fileobj: BinaryIO, info: zipfile.ZipInfo) -> RawMember:
+    """
+    Baca data terkompresi satu member langsung dari archive
+
+    Args:
+        fileobj: File archive sumber (dibuka dalam mode binary)
+        info: ZipInfo member dari zipfile.ZipFile.infolist()
+
+    Returns:
+        RawMember berisi data terkompresi member
+    """
+    fileobj.seek(info.header_offset)
+    header = _LOCAL_HEADER.unpack(fileobj.read(_LOCAL_HEADER.size))
+    if header[0] != _LOCAL_SIGNATURE:
+        raise zipfile.BadZipFile(f"Bad local header for {info.filename}")
+
+    name_length, extra_length = header[9], header[10]
+    fileobj.seek(name_length + extra_length, 1)
+    data = fileobj.read(info.compress_size)
+
+    return RawMember(
+        filename=info.filename,
+        data=data,
+        crc=info.CRC,
+        file_size=info.file_size,
+        compress_type=info.compress_type,
+        date_time=info.date_time,
+    )
+
+
+def compress_member(filename: str, blob: bytes,
+                    compress_type: int = zipfile.ZIP_DEFLATED,
+                    date_time: Tuple[int, int, int, int, int, int] = None) -> RawMember:
+    """
+    Kompres isi member baru menjadi RawMember
+
+    Args:
+        filename: Nama member dalam archive
+        blob: Isi member (belum terkompresi)
+        compress_type: ZIP_DEFLATED atau ZIP_STORED
+        date_time: Timestamp member (default: waktu sekarang)
+
+    Returns:
+        RawMember siap ditulis
+    """
+    if compress_type == zipfile.ZIP_DEFLATED:
+        compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        data = compressor.compress(blob) + compressor.flush()
+    else:
+        compress_type = zipfile.ZIP_STORED
+        data = blob
+
+    return RawMember(
+        filename=filename,
+        data=data,
+        crc=zlib.crc32(blob),
+        file_size=len(blob),
+        compress_type=compress_type,
+        date_time=date_time or time.localtime(time.time())[:6],
+    )
+
+
+def compress_media(filename: str, blob: bytes, sha1: str = None) -> RawMember:
+    """
+    Seperti compress_member, tapi hasil kompres isi yang sama dipakai ulang,
+    sehingga image yang sama (misalnya logo di setiap dokumen batch) hanya
+    di-deflate sekali
+
+    Args:
+        filename: Nama member dalam archive
+        blob: Isi member (belum terkompresi)
+        sha1: SHA1 hex isi member jika sudah diketahui
+
+    Returns:
+        RawMember siap ditulis
+    """
+    global _media_cache_size
+    sha1 = sha1 or hashlib.sha1(blob).hexdigest()
+    with _media_cache_lock:
+        member = _media_cache.get(sha1)
+        if member is not None:
+            _media_cache.move_to_end(sha1)
+
+    if member is None:
+        member = compress_member(filename, blob)
+        with _media_cache_lock:
+            if sha1 not in _media_cache and len(member.data) <= _MEDIA_CACHE_BYTES:
+                _media_cache[sha1] = member
+                _media_cache_size += len(member.data)
+                while _media_cache_size > _MEDIA_CACHE_BYTES:
+                    _, evicted = _media_cache.popitem(last=False)
+                    _media_cache_size -= len(evicted.data)
+
+    return dataclasses.replace(member, filename=filename)
+
+
+def _dos_date_time(date_time: Tuple[int, int, int, int, int, int]) -> Tuple[int, int]:
+    year, month, day, hour, minute, second = date_time
+    dos_time = (hour << 11) | (minute << 5) | (second // 2)
+    dos_date = (max(year, 1980) - 1980) << 9 | (month << 5) | day
+    return dos_time, dos_date
+
+
+class ZipStreamWriter:
+    """
+    Writer ZIP sederhana: member mentah (RawMember) ditulis apa adanya, dan
+    member besar bisa di-stream (deflate bertahap + data descriptor)
+    """
+
+    def __init__(self, fileobj: BinaryIO):
+        """
+        Args:
+            fileobj: File output (mode binary)
+        """
+        self.fileobj = fileobj
+        self.central: List[bytes] = []
+        self.offset = fileobj.tell()
+
+    def _write_header(self, filename: str, flags: int, compress_type: int,
+                      date_time: Tuple[int, int, int, int, int, int],
+                      crc: int, compress_size: int, file_size: int) -> Tuple[bytes, int, int]:
+        if self.offset > _MAX_ZIP32:
+            raise zipfile.LargeZipFile("Package too large for ZIP32")
+
+        name = filename.encode('utf-8')
+        if not filename.isascii():
+            flags |= _UTF8_FLAG
+        dos_time, dos_date = _dos_date_time(date_time)
+
+        self.fileobj.write(_LOCAL_HEADER.pack(
+            _LOCAL_SIGNATURE, _VERSION, flags, compress_type,
+            dos_time, dos_date, crc, compress_size, file_size, len(name), 0
+        ))
+        self.fileobj.write(name)
+        return name, flags, self.offset
+
+    def _add_central(self, name: bytes, flags: int, compress_type: int,
+                     date_time: Tuple[int, int, int, int, int, int],
+                     crc: int, compress_size: int, file_size: int, offset: int):
+        if compress_size > _MAX_ZIP32 or file_size > _MAX_ZIP32:
+            raise zipfile.LargeZipFile("Member too large for ZIP32")
+
+        dos_time, dos_date = _dos_date_time(date_time)
+        self.central.append(_CENTRAL_HEADER.pack(
+            _CENTRAL_SIGNATURE, _VERSION, _VERSION, flags, compress_type,
+            dos_time, dos_date, crc, compress_size, file_size,
+            len(name), 0, 0, 0, 0, 0, offset
+        ) + name)
+
+    def write_member(self, member: RawMember):
+        """
+        Tulis member yang datanya sudah terkompresi
+
+        Args:
+            member: RawMember (dari read_raw_member atau compress_member)
+        """
+        name, flags, offset = self._write_header(
+            member.filename, 0, member.compress_type, member.date_time,
+            member.crc, len(member.data), member.file_size
+        )
+        self.fileobj.write(member.data)
+        self.offset += _LOCAL_HEADER.size + len(name) + len(member.data)
+        self._add_central(name, flags, member.compress_type, member.date_time,
+                          member.crc, len(member.data), member.file_size, offset)
+
+    @contextmanager
+    def open_member(self, filename: str,
+                    date_time: Tuple[int, int, int, int, int, int] = None):
+        """
+        Buka member baru untuk ditulis bertahap (deflate streaming)
+
+        Args:
+            filename: Nama member dalam archive
+            date_time: Timestamp member (default: waktu sekarang)
+
+        Yields:
+            Object dengan method write(bytes)
+        """
+        date_time = date_time or time.localtime(time.time())[:6]
+        name, flags, offset = self._write_header(
+            filename, _DATA_DESCRIPTOR_FLAG, zipfile.ZIP_DEFLATED, date_time, 0, 0, 0
+        )
+        stream = _DeflateStream(self.fileobj)
+        yield stream
+        stream.finish()
+
+        self.fileobj.write(_DATA_DESCRIPTOR.pack(
+            _DATA_DESCRIPTOR_SIGNATURE, stream.crc, stream.compress_size, stream.file_size
+        ))
+        self.offset += (_LOCAL_HEADER.size + len(name) + stream.compress_size
+                        + _DATA_DESCRIPTOR.size)
+        self._add_central(name, flags, zipfile.ZIP_DEFLATED, date_time,
+                          stream.crc, stream.compress_size, stream.file_size, offset)
+
+    def close(self):
+        """Tulis central directory"""
+        directory = b''.join(self.central)
+        self.fileobj.write(directory)
+        self.fileobj.write(_END_RECORD.pack(
+            _END_SIGNATURE, 0, 0, len(self.central), len(self.central),
+            len(directory), self.offset, 0
+        ))
+
+
+class _DeflateStream:
+    """File-like untuk satu member yang di-deflate secara bertahap"""
+
+    def __init__(self, fileobj: BinaryIO):
+        self.fileobj = fileobj
+        self.compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        self.crc = 0
+        self.file_size = 0
+        self.compress_size = 0
+
+    def write(self, data: bytes) -> int:
+        self.crc = zlib.crc32(data, self.crc)
+        self.file_size += len(data)
+        compressed = self.compressor.compress(data)
+        if compressed:
+            self.fileobj.write(compressed)
+            self.compress_size += len(compressed)
+        return len(data)
+
+    def finish(self):
+        compressed = self.compressor.flush()
+        self.fileobj.write(compressed)
+        self.compress_size += len(compressed)
+
+
+def write_package(fileobj: BinaryIO, members: List[RawMember]):
+    """
+    Tulis archive ZIP dari list RawMember (tanpa kompresi ulang)
+
+    Args:
+        fileobj: File output (mode binary)
+        members: Member yang akan ditulis, sesuai urutan
+    """
+    writer = ZipStreamWriter(fileobj)
+    for member in members:
+        writer.write_member(member)
+    writer.close()
+
+
+class ChecksumWriter:
+    """
+    Writer package (interface PhysPkgWriter python-docx) yang hanya mencatat
+    CRC32 dan ukuran setiap member, dipakai sebagai baseline saat load
+    """
+
+    def __init__(self):
+        self.checksums: Dict[str, Tuple[int, int]] = {}
+
+    def write(self, pack_uri, blob: bytes):
+        name = getattr(pack_uri, 'membername', pack_uri)
+        self.checksums[name] = (zlib.crc32(blob), len(blob))
+
+    def close(self):
+        pass
+
+
+class RawCopyWriter:
+    """
+    Writer package (interface PhysPkgWriter python-docx) yang menyalin member
+    tidak berubah byte-per-byte dari archive sumber. Hanya member yang isinya
+    berbeda dari baseline (atau member baru) yang dikompres ulang.
+    """
+
+    def __init__(self, output, source, baseline: Dict[str, Tuple[int, int]]):
+        """
+        Args:
+            output: Path atau file-like object tujuan
+            source: Archive sumber (file DOCX yang diload), path atau file-like object
+            baseline: Dictionary membername -> (crc32, size) saat load
+        """
+        self.output = output
+        self.source = open(source, 'rb') if isinstance(source, (str, os.PathLike)) else source
+        self.source_infos = {
+            info.filename: info for info in zipfile.ZipFile(self.source).infolist()
+        }
+        self.baseline = baseline
+        self.members: List[RawMember] = []
+        self.copied = 0
+
+    def write(self, pack_uri, blob: bytes):
+        name = getattr(pack_uri, 'membername', pack_uri)
+        info = self.source_infos.get(name)
+
+        if info is not None and self.baseline.get(name) == (zlib.crc32(blob), len(blob)):
+            self.members.append(read_raw_member(self.source, info))
+            self.copied += 1
+        elif info is None and name.startswith('word/media/'):
+            self.members.append(compress_media(name, blob))
+        else:
+            date_time = info.date_time if info is not None else None
+            compress_type = info.compress_type if info is not None else zipfile.ZIP_DEFLATED
+            self.members.append(compress_member(name, blob, compress_type, date_time))
+
+    def close(self):
+        try:
+            if hasattr(self.output, 'write'):
+                write_package(self.output, self.members)
+            else:
+                with open(self.output, 'wb') as f:
+                    write_package(f, self.members)
+        finally:
+            self.source.close()
@@ -0,0 +1,31 @@
+"""
+Test output JSON CLI headless
+"""
+import json
+import sys
+from pathlib import Path
+
+from docx import Document
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import cli
+
+
+def test_render_failed_image_is_not_listed_as_replaced(tmp_path, capsys):
+    document = Document()
+    document.add_paragraph('Halo ${nama}')
+    document.add_paragraph('@{logo}')
+    template = tmp_path / 'template.docx'
+    document.save(str(template))
+
+    code = cli.main([
+        'render', str(template), '-o', str(tmp_path / 'output.docx'),
+        '--set', 'nama=Budi', '--set', f'logo={tmp_path / "nonexist.png"}',
+    ])
+    result = json.loads(capsys.readouterr().out)
+
+    assert code == cli.EXIT_WARNING
+    assert result['replaced'] == ['nama']
+    assert len(result['errors']) == 1
+    assert result['errors'][0].startswith('logo: ')
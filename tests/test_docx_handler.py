@@ -0,0 +1,42 @@
+"""
+Test DocxHandler: scan dan replace placeholder
+"""
+import sys
+from pathlib import Path
+
+from docx import Document
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from utils.docx_handler import DocxHandler
+
+
+def make_template(path: Path, *paragraphs: str) -> str:
+    document = Document()
+    for text in paragraphs:
+        document.add_paragraph(text)
+    document.save(str(path))
+    return str(path)
+
+
+def test_replace_placeholders(tmp_path):
+    template = make_template(tmp_path / 'template.docx', 'Halo ${nama} dari ${kota}')
+    handler = DocxHandler(template)
+    handler.replace_placeholders({'nama': 'Budi', 'kota': 'Bandung'})
+    handler.save(str(tmp_path / 'output.docx'))
+
+    assert Document(str(tmp_path / 'output.docx')).paragraphs[0].text == 'Halo Budi dari Bandung'
+
+
+def test_stray_image_prefix_does_not_hide_text_placeholder(tmp_path):
+    template = make_template(tmp_path / 'template.docx',
+                             'Kirim ke user@{ domain lama, lihat ${nama}')
+    handler = DocxHandler(template)
+
+    assert handler.find_all_placeholders() == {'nama'}
+
+    handler.replace_placeholders({'nama': 'Budi'})
+    handler.save(str(tmp_path / 'output.docx'))
+
+    assert Document(str(tmp_path / 'output.docx')).paragraphs[0].text == \
+        'Kirim ke user@{ domain lama, lihat Budi'
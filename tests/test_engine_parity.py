@@ -0,0 +1,136 @@
+"""
+Test kesamaan hasil DocxHandler, CompiledTemplate, dan StreamingDocxEngine
+untuk template yang didukung: teks paragraph, tabel, header, footer, dan image
+"""
+import sys
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from docx import Document
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from utils.docx_handler import DocxHandler
+from utils.stream_engine import StreamingDocxEngine
+
+PARAGRAPHS = [
+    'Halo ${nama}, selamat datang di ${kota}',
+    '${${nama}',
+    '$${nama} dan ${nama}}',
+    'x ${a${nama} y',
+    'Kirim ke user@{ domain lama, lihat ${nama}',
+    'Tidak diisi: ${unknown}',
+    'Baris ${multi} selesai',
+    'plain paragraph',
+]
+
+TEXT_VALUES = {
+    'nama': 'Budi & <Ani>',
+    'kota': 'Bandung',
+    'multi': 'satu\ndua\tdua',
+    'sel': 'isi sel',
+    'judul': 'Laporan',
+    'halaman': '7',
+}
+
+
+def build_template(path: Path) -> str:
+    document = Document()
+    for text in PARAGRAPHS:
+        document.add_paragraph(text)
+
+    # Placeholder yang terpecah ke beberapa run dengan formatting berbeda
+    paragraph = document.add_paragraph('Kepada ')
+    paragraph.add_run('${na').bold = True
+    paragraph.add_run('ma} di ${')
+    paragraph.add_run('kota}').italic = True
+
+    document.add_paragraph('@{logo}')
+    document.add_paragraph('@{missing_image}')
+
+    table = document.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = 'Sel ${sel}'
+    table.cell(0, 1).text = '${nama}'
+    table.cell(1, 0).text = '@{logo}'
+    table.cell(1, 1).text = 'tetap'
+
+    section = document.sections[0]
+    section.header.paragraphs[0].text = 'Header ${judul}'
+    section.footer.paragraphs[0].text = 'Halaman ${halaman}'
+
+    document.save(str(path))
+    return str(path)
+
+
+def extract(document) -> dict:
+    """Teks dan jumlah image yang terlihat di setiap bagian dokumen"""
+    section = document.sections[0]
+    parts = [document.part, section.header.part, section.footer.part]
+    return {
+        'paragraphs': [p.text for p in document.paragraphs],
+        'table': [[cell.text for cell in row.cells] for row in document.tables[0].rows],
+        'header': [p.text for p in section.header.paragraphs],
+        'footer': [p.text for p in section.footer.paragraphs],
+        'images': [len(part.element.xpath('.//pic:pic')) for part in parts],
+    }
+
+
+@pytest.fixture
+def template(tmp_path):
+    return build_template(tmp_path / 'template.docx')
+
+
+@pytest.fixture
+def image_values(tmp_path):
+    from PIL import Image
+
+    path = tmp_path / 'logo.png'
+    Image.new('RGB', (40, 20), 'red').save(path)
+    return {'logo': str(path)}
+
+
+def render_with_handler(template, image_values, tmp_path):
+    handler = DocxHandler(template)
+    handler.replace_placeholders(TEXT_VALUES)
+    handler.replace_image_placeholders(image_values)
+    output = tmp_path / 'handler.docx'
+    handler.save(str(output))
+    return Document(str(output))
+
+
+def render_with_compiled(template, image_values, tmp_path):
+    content = DocxHandler(template).render(TEXT_VALUES, image_values)
+    return Document(BytesIO(content))
+
+
+def render_with_stream(template, image_values, tmp_path):
+    output = tmp_path / 'stream.docx'
+    StreamingDocxEngine(template).render(str(output), TEXT_VALUES, image_values)
+    return Document(str(output))
+
+
+def test_engines_produce_same_content(template, image_values, tmp_path):
+    expected = extract(render_with_handler(template, image_values, tmp_path))
+
+    assert expected['paragraphs'][0] == 'Halo Budi & <Ani>, selamat datang di Bandung'
+    assert expected['paragraphs'][1] == '${Budi & <Ani>'
+    assert expected['table'][0] == ['Sel isi sel', 'Budi & <Ani>']
+    assert expected['header'] == ['Header Laporan']
+    assert expected['footer'] == ['Halaman 7']
+    assert expected['images'] == [2, 0, 0]
+
+    assert extract(render_with_compiled(template, image_values, tmp_path)) == expected
+    assert extract(render_with_stream(template, image_values, tmp_path)) == expected
+
+
+def test_scan_matches_across_engines(template):
+    handler = DocxHandler(template)
+    expected = handler.find_all_placeholders_with_types()
+
+    assert expected == (
+        {'nama', 'kota', 'unknown', 'multi', 'sel', 'judul', 'halaman'},
+        {'logo', 'missing_image'},
+    )
+    assert handler.compile().find_all_placeholders_with_types() == expected
+    assert StreamingDocxEngine(template).find_all_placeholders_with_types() == expected
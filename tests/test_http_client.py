@@ -0,0 +1,265 @@
+"""
+Test HttpClient terhadap stub HTTP server lokal: keep-alive, redirect,
+retry 503, batas ukuran response, dan batas request bersamaan per host
+"""
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from utils.http_client import HttpClient, HttpError, ResponseTooLarge, TooManyRedirects
+
+
+BODY = b'\x89PNG stub image body' * 64
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Route stub; state bersama disimpan di object server"""
+
+    protocol_version = 'HTTP/1.1'  # Keep-alive
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes = b'', headers: dict = None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+
+        if self.path == '/image':
+            self._send(200, BODY)
+        elif self.path == '/redirect':
+            self._send(302, headers={'Location': '/image'})
+        elif self.path == '/loop':
+            self._send(302, headers={'Location': '/loop'})
+        elif self.path == '/flaky':
+            with server.lock:
+                server.flaky_failures -= 1
+                failing = server.flaky_failures >= 0
+            if failing:
+                self._send(503, b'busy', {'Retry-After': '0'})
+            else:
+                self._send(200, BODY)
+        elif self.path == '/unavailable':
+            self._send(503, b'busy', {'Retry-After': '0'})
+        elif self.path == '/missing-large':
+            self._send(404, b'x' * (1024 * 1024))
+        elif self.path == '/large':
+            self._send(200, b'x' * 4096)
+        elif self.path == '/large-unsized':
+            # Tanpa Content-Length: batas harus dicek saat streaming
+            self.send_response(200)
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            for _ in range(8):
+                self.wfile.write(b'x' * 1024)
+            self.close_connection = True
+        elif self.path == '/slow':
+            with server.lock:
+                server.active += 1
+                server.peak_active = max(server.peak_active, server.active)
+            time.sleep(0.1)
+            with server.lock:
+                server.active -= 1
+            self._send(200, BODY)
+        else:
+            self._send(404, b'not found')
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    httpd.daemon_threads = True
+    httpd.lock = threading.Lock()
+    httpd.connections = 0
+    httpd.requests = []
+    httpd.flaky_failures = 0
+    httpd.active = 0
+    httpd.peak_active = 0
+
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={'poll_interval': 0.05},
+                              daemon=True)
+    thread.start()
+    httpd.base_url = f'http://127.0.0.1:{httpd.server_port}'
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def client():
+    http_client = HttpClient(max_per_host=2, timeout=5, max_bytes=2048,
+                             retries=2, backoff=0.01)
+    yield http_client
+    http_client.close()
+
+
+def test_get_streams_body(server, client):
+    destination = BytesIO()
+    status, headers = client.get(server.base_url + '/image', destination)
+
+    assert status == 200
+    assert headers['Content-Length'] == str(len(BODY))
+    assert destination.getvalue() == BODY
+
+
+def test_keep_alive_connection_is_reused(server, client):
+    for _ in range(3):
+        destination = BytesIO()
+        client.get(server.base_url + '/image', destination)
+        assert destination.getvalue() == BODY
+
+    assert server.connections == 1
+
+
+def test_redirect_is_followed(server, client):
+    destination = BytesIO()
+    status, _ = client.get(server.base_url + '/redirect', destination)
+
+    assert status == 200
+    assert destination.getvalue() == BODY
+    assert server.requests == ['/redirect', '/image']
+
+
+def test_redirect_loop_is_stopped(server, client):
+    with pytest.raises(TooManyRedirects):
+        client.get(server.base_url + '/loop', BytesIO())
+
+
+def test_503_is_retried(server, client):
+    server.flaky_failures = 2
+    destination = BytesIO()
+    status, _ = client.get(server.base_url + '/flaky', destination)
+
+    assert status == 200
+    assert destination.getvalue() == BODY
+    assert server.requests == ['/flaky'] * 3
+
+
+def test_503_raises_after_retries(server, client):
+    with pytest.raises(HttpError) as error:
+        client.get(server.base_url + '/unavailable', BytesIO())
+
+    assert error.value.status == 503
+    assert len(server.requests) == client.retries + 1
+
+
+def test_404_is_not_retried(server, client):
+    with pytest.raises(HttpError) as error:
+        client.get(server.base_url + '/missing', BytesIO())
+
+    assert error.value.status == 404
+    assert server.requests == ['/missing']
+
+
+def test_small_error_body_keeps_connection(server, client):
+    for _ in range(2):
+        with pytest.raises(HttpError):
+            client.get(server.base_url + '/missing', BytesIO())
+
+    client.get(server.base_url + '/image', BytesIO())
+    assert server.connections == 1
+
+
+def test_large_error_body_is_not_read(server, client):
+    with pytest.raises(HttpError) as error:
+        client.get(server.base_url + '/missing-large', BytesIO())
+    assert error.value.status == 404
+
+    # Body tidak dibaca sampai habis, jadi koneksinya ditutup dan tidak dipakai lagi
+    destination = BytesIO()
+    client.get(server.base_url + '/image', destination)
+    assert destination.getvalue() == BODY
+    assert server.connections == 2
+
+
+def test_response_too_large_by_content_length(server, client):
+    destination = BytesIO()
+    with pytest.raises(ResponseTooLarge):
+        client.get(server.base_url + '/large', destination)
+
+    assert destination.getvalue() == b''
+
+
+def test_response_too_large_while_streaming(server, client):
+    with pytest.raises(ResponseTooLarge):
+        client.get(server.base_url + '/large-unsized', BytesIO())
+
+
+def test_per_host_cap(server, client):
+    errors = []
+
+    def fetch():
+        try:
+            client.get(server.base_url + '/slow', BytesIO())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=fetch) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(server.requests) == 6
+    assert server.peak_active <= client.max_per_host
+    assert server.connections <= client.max_per_host
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='fork tidak tersedia')
+def test_idle_connections_are_not_shared_after_fork(server, client):
+    # Parent punya koneksi keep-alive idle sebelum fork
+    client.get(server.base_url + '/image', BytesIO())
+    assert server.connections == 1
+
+    read_fd, write_fd = os.pipe()
+    pids = []
+    for _ in range(3):
+        pid = os.fork()
+        if pid == 0:  # Child process
+            ok = False
+            try:
+                ok = not client._idle
+                for _ in range(3):
+                    destination = BytesIO()
+                    client.get(server.base_url + '/image', destination)
+                    ok = ok and destination.getvalue() == BODY
+            finally:
+                os.write(write_fd, b'1' if ok else b'0')
+                os._exit(0)
+        pids.append(pid)
+
+    for pid in pids:
+        os.waitpid(pid, 0)
+    os.close(write_fd)
+    results = os.read(read_fd, 16)
+    os.close(read_fd)
+
+    assert results == b'111'
+    # Setiap child membuka koneksi sendiri, parent tetap memakai koneksinya
+    assert server.connections == 1 + len(pids)
+    destination = BytesIO()
+    client.get(server.base_url + '/image', destination)
+    assert destination.getvalue() == BODY
+    assert server.connections == 1 + len(pids)
@@ -0,0 +1,35 @@
+"""
+Test deteksi placeholder
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from utils.placeholder import PlaceholderHandler
+
+
+def test_find_all_placeholders_with_type():
+    text = 'Halo ${nama}, logo @{logo} dan ${kota}'
+
+    assert PlaceholderHandler.find_all_placeholders_with_type(text) == (
+        {'nama', 'kota'}, {'logo'}
+    )
+
+
+def test_stray_image_prefix_does_not_hide_text_placeholder():
+    text = 'Kirim ke user@{ domain lama, lihat ${nama}'
+    text_placeholders, image_placeholders = \
+        PlaceholderHandler.find_all_placeholders_with_type(text)
+
+    assert text_placeholders == PlaceholderHandler.find_placeholders(text) == {'nama'}
+    assert image_placeholders == PlaceholderHandler.find_image_placeholders(text)
+
+
+def test_stray_text_prefix_does_not_hide_image_placeholder():
+    text = 'Harga $5 ${ lihat @{logo}'
+    text_placeholders, image_placeholders = \
+        PlaceholderHandler.find_all_placeholders_with_type(text)
+
+    assert text_placeholders == PlaceholderHandler.find_placeholders(text)
+    assert image_placeholders == {'logo'}